@@ -1,16 +1,24 @@
 import os
 import io
 import json
+import queue
 import base64
+import hashlib
+import importlib
+import mmap
 import re
+import shutil
 import time
 import threading
 import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import requests
-from flask import Flask, request, redirect, abort, jsonify, render_template_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, request, redirect, abort, jsonify, send_file
 
 # -------- Configuration (env) --------
 # GitHub repo where gh-pages hosts the PDFs
@@ -22,25 +30,102 @@ PAGES_BASE   = os.environ["PAGES_BASE"]    # e.g. "https://your-org.github.io/yo
 
 # Build behaviour
 SCENARIOS = [1, 2, 3, 4, 5]
+TOTAL_STEPS = (len(SCENARIOS) * 2) + 6  # generate + compile per scenario (x2), plus index + upload + pages build trigger/wait + propagate + done
 PAGES_BUILD_TIMEOUT_S   = int(os.environ.get("PAGES_BUILD_TIMEOUT_S", "180"))
 PAGES_PROPAGATE_TIMEOUT = int(os.environ.get("PAGES_PROPAGATE_TIMEOUT", "90"))
 POLL_INTERVAL_S         = float(os.environ.get("POLL_INTERVAL_S", "1.2"))
+SSE_KEEPALIVE_S         = float(os.environ.get("SSE_KEEPALIVE_S", "15"))
+BUILD_WORKERS           = int(os.environ.get("BUILD_WORKERS", "2"))
+
+# The handouts have no \ref, \cite or \tableofcontents, so the first pdflatex
+# pass is already final; latexmk's extra passes would only repeat it.
+# LATEX_ENGINE=tectonic swaps in Tectonic, which starts faster and keeps its own
+# package cache (the image must provide the binary and a warmed cache).
+LATEX_ENGINE = os.environ.get("LATEX_ENGINE", "pdflatex")
+LATEX_CMDS = {
+    "pdflatex": ["pdflatex", "-interaction=batchmode", "-halt-on-error"],
+    "tectonic": ["tectonic", "-X", "compile", "--keep-logs", "--outdir", "."],
+}
+LATEX_CMD = LATEX_CMDS[LATEX_ENGINE]
+# A wedged compile is killed after this long instead of holding a build worker
+LATEX_TIMEOUT_S = int(os.environ.get("LATEX_TIMEOUT_S", "120"))
+LATEX_LOG_TAIL  = 50  # log lines quoted in the status when a compile fails
+
+# With pdflatex, the package preamble the generators share (everything before
+# the endofdump marker) is dumped once into a format file via mylatexformat,
+# so each compile starts from the loaded packages instead of re-reading them.
+FMT_MARKER = r"\csname endofdump\endcsname"
+
+# pdflatex output is made reproducible, so a handout recompiled after a cache
+# miss has the same git blob as the published one and its upload is skipped:
+# FORCE_SOURCE_DATE pins CreationDate/ModDate (and \today) to this epoch, and
+# a fixed \pdftrailerid replaces the /ID pdfTeX would otherwise derive from
+# the time and the (random) scratch directory. Tectonic output is not pinned,
+# so there the skip only fires for PDFs served from the cache.
+PDF_SOURCE_DATE_EPOCH = "1756684800"  # 2025-09-01, start of the 2025/26 session
+
+# Compiled PDFs are cached on disk, keyed by UUID and generator version, so a
+# retried build skips LaTeX entirely
+CACHE_DIR              = Path(os.environ.get("CACHE_DIR", os.path.join(tempfile.gettempdir(), "mengm0056-pdf-cache")))
+CACHE_MAX_MB           = int(os.environ.get("CACHE_MAX_MB", "512"))
+CACHE_PRUNE_INTERVAL_S = int(os.environ.get("CACHE_PRUNE_INTERVAL_S", "600"))
+FMT_DIR                = CACHE_DIR / "fmt"  # dumped preamble formats, pruned with the PDFs
+
+# Per-build scratch space (generated .tex, aux/log files, PDFs before caching)
+# goes on tmpfs when there is one. Docker's default /dev/shm is only 64 MB:
+# run with --shm-size=256m, or set SCRATCH_DIR to another directory.
+SCRATCH_DIR = os.environ.get("SCRATCH_DIR") or ("/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+# Blob uploads run concurrently but are paced to stay clear of GitHub's
+# secondary (abuse) rate limits
+BLOB_UPLOAD_WORKERS = 3
+GH_MAX_BLOB_REQS_PER_S = float(os.environ.get("GH_MAX_BLOB_REQS_PER_S", "3"))
+
+# Canonical UUID shape, lower-case only. Input is trimmed (as the generators
+# do) but never case-folded: the seed is hashed from the UUID text, so folding
+# would give a mixed-case UUID other parameters than the Actions workflow does
+UUID_RE = re.compile(r"\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
 
 app = Flask(__name__)
 
 # -------- Minimal in-process status store (single worker) --------
-STATUS = {}  # uuid -> dict
-STATUS_LOCK = threading.Lock()
+# Each entry is an immutable snapshot: writers build a new dict and swap it in
+# with a single (GIL-atomic) assignment, so readers never need the lock.
+STATUS = {}  # uuid -> dict (never mutated after publication)
+STATUS_LOCK = threading.Lock()  # serialises writers only
+STATUS_CHANGED = threading.Condition(STATUS_LOCK)  # notified on every update (SSE)
+STATUS_VERSION = 0  # bumped on every update
 
 def set_status(uuid, **fields):
-    with STATUS_LOCK:
-        s = STATUS.get(uuid, {})
-        s.update(fields)
-        STATUS[uuid] = s
+    global STATUS_VERSION
+    with STATUS_CHANGED:
+        STATUS[uuid] = {**STATUS.get(uuid, {}), **fields}
+        STATUS_VERSION += 1
+        STATUS_CHANGED.notify_all()
 
 def get_status(uuid):
-    with STATUS_LOCK:
-        return dict(STATUS.get(uuid, {}))
+    # Returned dict is shared; copy before modifying
+    return STATUS.get(uuid, {})
+
+# -------- HTTP session (keep-alive + retries, shared by all outbound calls) --------
+# Auth headers are passed per call rather than set on the session so the
+# GitHub token is never sent to the Pages host.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET", "PUT", "POST", "HEAD", "PATCH"],
+        raise_on_status=False
+    )
+))
+
+# (connect, read) timeout for GitHub API calls, applied per attempt so a
+# stalled socket cannot hold one of the BUILD_WORKERS threads forever
+GH_TIMEOUT = (5, 30)
 
 # -------- GitHub helpers --------
 def _gh_headers():
@@ -50,59 +135,138 @@ def _gh_headers():
         "User-Agent": "mengm0056-pdf-uploader"
     }
 
-def _gh_contents_url(path):
-    return f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/contents/{path}"
-
-def gh_get(path):
-    return requests.get(_gh_contents_url(path), headers=_gh_headers(), params={"ref": PAGES_BRANCH})
-
-def gh_put(path, data_bytes, message, sha=None):
-    content_b64 = base64.b64encode(data_bytes).decode("ascii")
-    payload = {
-        "message": message,
-        "content": content_b64,
-        "branch": PAGES_BRANCH,
-        "committer": {"name": "PDF Bot", "email": "no-reply@example.com"}
-    }
-    if sha:
-        payload["sha"] = sha
-    r = requests.put(_gh_contents_url(path), headers=_gh_headers(), data=json.dumps(payload))
-    if r.status_code not in (200, 201):
-        raise RuntimeError(f"GitHub upload failed for {path}: {r.status_code} {r.text}")
+def _gh_git_url(path):
+    return f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/git/{path}"
+
+def _gh_git_call(method, path, payload=None, ok=(200,), params=None):
+    # payload may be a ready-made JSON body (bytes) or any JSON-serialisable object
+    if payload is not None and not isinstance(payload, bytes):
+        payload = json.dumps(payload)
+    r = SESSION.request(method, _gh_git_url(path), headers=_gh_headers(), data=payload, params=params,
+                        timeout=GH_TIMEOUT)
+    if r.status_code not in ok:
+        raise RuntimeError(f"GitHub {method} git/{path} failed: {r.status_code} {r.text}")
     return r.json()
 
-def upload_file(path_in_repo: str, local_path: Path, commit_msg: str):
-    sha = None
-    r = gh_get(path_in_repo)
-    if r.status_code == 200:
-        try:
-            sha = r.json().get("sha")
-        except Exception:
-            sha = None
+_gh_pace_lock = threading.Lock()
+_gh_next_slot = 0.0
+
+def _gh_pace():
+    # Hand out request slots at most GH_MAX_BLOB_REQS_PER_S per second
+    global _gh_next_slot
+    with _gh_pace_lock:
+        now = time.monotonic()
+        slot = max(now, _gh_next_slot)
+        _gh_next_slot = slot + 1.0 / GH_MAX_BLOB_REQS_PER_S
+    if slot > now:
+        time.sleep(slot - now)
+
+def gh_create_blob(data) -> str:
+    # base64 output is plain ASCII and never needs JSON escaping, so the body is
+    # assembled as bytes instead of decoding to str and running it through json.dumps
+    _gh_pace()
+    body = b'{"encoding":"base64","content":"' + base64.b64encode(data) + b'"}'
+    return _gh_git_call("POST", "blobs", body, ok=(201,))["sha"]
+
+def _upload_blob(local_path: Path) -> str:
+    with open(local_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return gh_create_blob(buf)
+
+def git_blob_sha(local_path: Path) -> str:
+    # Same object id git (and therefore the Trees API) assigns to this content
     with open(local_path, "rb") as f:
-        gh_put(path_in_repo, f.read(), commit_msg, sha=sha)
-
-def uuid_folder_exists(uuid: str) -> bool:
-    return gh_get(f"{uuid}").status_code == 200
+        data = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def commit_files(files: dict, commit_msg: str, existing: dict) -> bool:
+    # files: path in repo -> local Path; everything lands in a single commit on PAGES_BRANCH.
+    # Files already on the branch byte-for-byte (existing: path -> sha from list_tree)
+    # are left out; returns False when nothing needed committing.
+    files = {path: local for path, local in files.items() if existing.get(path) != git_blob_sha(local)}
+    if not files:
+        return False
+
+    head_sha = _gh_git_call("GET", f"ref/heads/{PAGES_BRANCH}")["object"]["sha"]
+    base_tree = _gh_git_call("GET", f"commits/{head_sha}")["tree"]["sha"]
+
+    with ThreadPoolExecutor(max_workers=BLOB_UPLOAD_WORKERS) as pool:
+        blob_shas = list(pool.map(_upload_blob, files.values()))
+    entries = [{"path": path_in_repo, "mode": "100644", "type": "blob", "sha": blob_sha}
+               for path_in_repo, blob_sha in zip(files, blob_shas)]
+
+    tree_sha = _gh_git_call("POST", "trees", {"base_tree": base_tree, "tree": entries}, ok=(201,))["sha"]
+    bot = {"name": "PDF Bot", "email": "no-reply@example.com"}
+    commit_sha = _gh_git_call("POST", "commits", {
+        "message": commit_msg,
+        "tree": tree_sha,
+        "parents": [head_sha],
+        "author": bot,
+        "committer": bot
+    }, ok=(201,))["sha"]
+    _gh_git_call("PATCH", f"refs/heads/{PAGES_BRANCH}", {"sha": commit_sha})
+    return True
+
+def list_tree(uuid: str, ref=PAGES_BRANCH) -> dict:
+    # Every path on the branch (files and folders) -> object sha, in one request.
+    # Once the branch outgrows GitHub's limit for recursive listings the answer
+    # is truncated; then just the <uuid>/ folder, all a build looks at, is read
+    # level by level instead of passing published files off as missing.
+    info = _gh_git_call("GET", f"trees/{ref}", params={"recursive": "1"})
+    if not info.get("truncated"):
+        return {entry["path"]: entry["sha"] for entry in info.get("tree", [])}
+
+    root = _gh_git_call("GET", f"trees/{ref}")
+    if root.get("truncated"):
+        raise RuntimeError(f"Listing of {PAGES_BRANCH} is truncated even without recursion")
+    folder = next((e for e in root.get("tree", []) if e["path"] == uuid and e["type"] == "tree"), None)
+    if folder is None:
+        return {}
+    files = _gh_git_call("GET", f"trees/{folder['sha']}").get("tree", [])
+    return {uuid: folder["sha"], **{f"{uuid}/{e['path']}": e["sha"] for e in files}}
+
+def published_paths(uuid: str) -> list:
+    return [f"{uuid}/mengm0056_s{s}_handout.pdf" for s in SCENARIOS] + [f"{uuid}/index.html"]
+
+def uuid_folder_exists(uuid: str, tree: dict) -> bool:
+    # Complete folders only: a partial upload (e.g. from an interrupted
+    # per-file upload) is rebuilt, and the unchanged files are skipped
+    return all(path in tree for path in published_paths(uuid))
+
+def uuid_live_on_pages(uuid: str) -> bool:
+    # Unauthenticated, edge-cached check that does not count against the API rate limit
+    try:
+        r = SESSION.head(f"{PAGES_BASE}/{uuid}/index.html", allow_redirects=True, timeout=3)
+        return r.status_code == 200
+    except requests.RequestException:
+        return False
 
 # -------- GitHub Pages build/ready helpers --------
 def trigger_pages_build():
     url = f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/pages/builds"
-    r = requests.post(url, headers=_gh_headers())
+    r = SESSION.post(url, headers=_gh_headers(), timeout=GH_TIMEOUT)
     if r.status_code not in (200, 201, 204):
         raise RuntimeError(f"Failed to trigger Pages build: {r.status_code} {r.text}")
 
 def get_latest_pages_build():
     url = f"https://api.github.com/repos/{GH_OWNER}/{GH_REPO}/pages/builds/latest"
-    r = requests.get(url, headers=_gh_headers())
+    r = SESSION.get(url, headers=_gh_headers(), timeout=GH_TIMEOUT)
     if r.status_code != 200:
         raise RuntimeError(f"Failed to fetch latest Pages build: {r.status_code} {r.text}")
     return r.json()  # includes 'status': 'built'|'building'|'errored'
 
-def wait_for_pages_build(max_seconds=PAGES_BUILD_TIMEOUT_S, poll_every=3):
-    deadline = time.time() + max_seconds
+# Poll delays grow 0.5s, 0.75s, 1.1s, ... up to 5s: fast builds are noticed
+# quickly and slow ones do not burn through API calls
+def _poll_delay(attempt, first=0.5, cap=5.0):
+    return min(cap, first * (1.5 ** attempt))
+
+def _sleep_until_next_poll(attempt, deadline):
+    time.sleep(max(0.0, min(_poll_delay(attempt), deadline - time.monotonic())))
+
+def wait_for_pages_build(max_seconds=PAGES_BUILD_TIMEOUT_S):
+    deadline = time.monotonic() + max_seconds
     last_status = None
-    while time.time() < deadline:
+    attempt = 0
+    while time.monotonic() < deadline:
         try:
             info = get_latest_pages_build()
             last_status = info.get("status")
@@ -110,95 +274,293 @@ def wait_for_pages_build(max_seconds=PAGES_BUILD_TIMEOUT_S, poll_every=3):
                 return last_status
         except Exception:
             pass
-        time.sleep(poll_every)
+        _sleep_until_next_poll(attempt, deadline)
+        attempt += 1
     return last_status or "unknown"
 
-def wait_for_url_200(url, max_seconds=PAGES_PROPAGATE_TIMEOUT, poll_every=3):
-    deadline = time.time() + max_seconds
-    while time.time() < deadline:
+def wait_for_url_200(url, max_seconds=PAGES_PROPAGATE_TIMEOUT):
+    deadline = time.monotonic() + max_seconds
+    attempt = 0
+    while time.monotonic() < deadline:
         try:
-            r = requests.head(url, allow_redirects=True, timeout=5)
+            r = SESSION.head(url, allow_redirects=True, timeout=5)
             if r.status_code == 200:
                 return True
         except Exception:
             pass
-        time.sleep(poll_every)
+        _sleep_until_next_poll(attempt, deadline)
+        attempt += 1
     return False
 
-# -------- Build + publish (runs in background thread) --------
-def build_and_publish(uuid: str):
-    try:
-        total_steps = (len(SCENARIOS) * 3) + 4   # generate + compile + upload per scenario (x3), plus index upload + pages build + propagate + done
-        step = 0
-        set_status(uuid, stage="starting", step=step, total=total_steps, done=False, error=None)
-
-        # If already live on Pages, finish immediately
-        if uuid_folder_exists(uuid):
-            set_status(uuid, stage="already_published", step=total_steps-1)
-            set_status(uuid, done=True, pages_url=f"{PAGES_BASE}/{uuid}/")
-            return
-
-        with tempfile.TemporaryDirectory(prefix=f"{uuid}_") as tmp:
-            tmpdir = Path(tmp)
-
-            # Generate + compile each scenario
-            for s in SCENARIOS:
-                step += 1; set_status(uuid, stage=f"generate_s{s}", step=step)
-                tex_path = tmpdir / f"mengm0056_s{s}_handout.tex"
-                with open(tex_path, "w", encoding="utf-8") as tex_out:
-                    subprocess.run(["python", f"generate_s{s}_handout.py", "--uuid", uuid],
-                                   stdout=tex_out, check=True)
-
-                step += 1; set_status(uuid, stage=f"compile_s{s}", step=step)
-                subprocess.run(
-                    ["latexmk", "-pdf", "-interaction=nonstopmode", "-halt-on-error", tex_path.name],
-                    cwd=str(tmpdir), check=True
-                )
+# -------- Scenario generators (imported once, run in-process) --------
+GENERATORS = {s: importlib.import_module(f"generate_s{s}_handout") for s in SCENARIOS}
+# Hash of each generator's source as imported, so the PDF cache key describes
+# the code actually running rather than a file edited since startup (and is
+# the same on every checkout of that code)
+GENERATOR_VERSIONS = {s: hashlib.sha256(Path(gen.__file__).read_bytes()).hexdigest()[:16]
+                      for s, gen in GENERATORS.items()}
+
+# -------- Compiled PDF cache --------
+def cached_pdf_path(uuid: str, s: int) -> Path:
+    # The generator's source hash and the engine are part of the key so a
+    # restart with an edited scenario, or a switch of engines, invalidates it
+    key = hashlib.sha256(f"{uuid}|{GENERATOR_VERSIONS[s]}|{LATEX_ENGINE}".encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{key}.pdf"
+
+def store_cached_pdf(pdf_path: Path, cached: Path):
+    # Copy next to the final name, then rename, so readers never see a partial file
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(f"{cached.name}.{threading.get_ident()}.tmp")
+    shutil.copyfile(pdf_path, tmp)
+    os.replace(tmp, cached)
+
+def prune_cache():
+    # Least recently used PDFs and formats go first once the cache outgrows
+    # CACHE_MAX_MB; a format removed here is simply dumped again on next use
+    entries = []
+    for f in [*CACHE_DIR.glob("*.pdf"), *FMT_DIR.glob("*.fmt")]:
+        try:
+            st = f.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, f))
+    budget = CACHE_MAX_MB * 1024 * 1024
+    for _mtime, size, f in sorted(entries, reverse=True):
+        budget -= size
+        if budget < 0:
+            f.unlink(missing_ok=True)
+
+def _cache_housekeeper():
+    while True:
+        time.sleep(CACHE_PRUNE_INTERVAL_S)
+        try:
+            prune_cache()
+        except OSError:
+            pass
 
-            # Write per-UUID index.html
-            step += 1; set_status(uuid, stage="write_index", step=step)
-            html = f"""<!doctype html>
+# -------- Preamble format (pdflatex only) --------
+_fmt_lock = threading.Lock()
+_fmt_failed = set()
+
+def preamble_format(tex_path: Path):
+    # Returns the name of a format holding this document's shared preamble,
+    # dumping it on first use; None means compile the document the normal way
+    if LATEX_ENGINE != "pdflatex":
+        return None
+    head, marker, _ = tex_path.read_text(encoding="utf-8").partition(FMT_MARKER)
+    if not marker:
+        return None
+    name = "handout-" + hashlib.sha256(head.encode("utf-8")).hexdigest()[:12]
+    if name in _fmt_failed:
+        return None
+    fmt_path = FMT_DIR / f"{name}.fmt"
+    try:
+        os.utime(fmt_path)  # already dumped; mark as recently used
+        return name
+    except FileNotFoundError:
+        pass
+
+    # Dumped under a job name of its own and renamed into place, so no lock is
+    # held while pdflatex runs; threads racing on a new preamble each dump it
+    # and the last rename wins. Only the .fmt is kept.
+    job = f"{name}-{os.getpid()}-{threading.get_ident()}"
+    FMT_DIR.mkdir(parents=True, exist_ok=True)
+    (FMT_DIR / f"{job}.tex").write_text(head + marker + "\n", encoding="utf-8")
+    try:
+        subprocess.run(
+            ["pdflatex", "-ini", f"-jobname={job}", "&pdflatex", "mylatexformat.ltx", f"{job}.tex"],
+            cwd=str(FMT_DIR), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            timeout=LATEX_TIMEOUT_S
+        )
+        with _fmt_lock:
+            os.replace(FMT_DIR / f"{job}.fmt", fmt_path)
+    except (OSError, subprocess.SubprocessError):
+        with _fmt_lock:
+            _fmt_failed.add(name)
+        return None
+    finally:
+        for ext in (".tex", ".log", ".fmt"):
+            (FMT_DIR / f"{job}{ext}").unlink(missing_ok=True)
+    return name
+
+class LatexError(RuntimeError):
+    # timed_out: the engine was killed after LATEX_TIMEOUT_S. no_log: it exited
+    # before opening its .log, which with -fmt= means the format did not load
+    def __init__(self, message, timed_out=False, no_log=False):
+        super().__init__(message)
+        self.timed_out = timed_out
+        self.no_log = no_log
+
+def run_latex(args, tex_path: Path, env):
+    # The engine's console output is discarded (the .log on disk keeps all of
+    # it), so nothing ever blocks on a full pipe; on failure the tail of that
+    # log becomes the error message
+    try:
+        subprocess.run(LATEX_CMD + args + [tex_path.name], cwd=str(tex_path.parent), env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=LATEX_TIMEOUT_S)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        try:
+            log = tex_path.with_suffix(".log").read_text(encoding="utf-8", errors="replace")
+            tail = "\n".join(log.splitlines()[-LATEX_LOG_TAIL:])
+            no_log = False
+        except OSError:
+            tail = "(no log written)"
+            no_log = True
+        raise LatexError(f"{tex_path.name}: {e}\n{tail}",
+                         timed_out=isinstance(e, subprocess.TimeoutExpired), no_log=no_log) from e
+
+# Per-UUID index.html; the links are relative, so the same page works on
+# Pages and under /cached/<uuid>/
+def index_html(uuid: str) -> str:
+    return f"""<!doctype html>
 <meta charset="utf-8">
 <title>Scenario PDFs for {uuid}</title>
 <h1>Scenario PDFs for {uuid}</h1>
 <ul>
   {''.join([f'<li><a href="mengm0056_s{s}_handout.pdf">Scenario {s}</a></li>' for s in SCENARIOS])}
 </ul>"""
-            (tmpdir / "index.html").write_text(html, encoding="utf-8")
 
-            # Upload PDFs and index to gh-pages/<uuid>/
-            commit_msg = f"Add scenario PDFs for {uuid}"
-            for s in SCENARIOS:
-                step += 1; set_status(uuid, stage=f"upload_s{s}", step=step)
-                upload_file(f"{uuid}/mengm0056_s{s}_handout.pdf", tmpdir / f"mengm0056_s{s}_handout.pdf", commit_msg)
+# Generate + compile one scenario inside its own working directory
+def build_scenario(uuid: str, s: int, workdir: Path) -> Path:
+    workdir.mkdir(parents=True, exist_ok=True)
+    pdf_path = workdir / f"mengm0056_s{s}_handout.pdf"
+    cached = cached_pdf_path(uuid, s)
+    if cached.exists():
+        shutil.copyfile(cached, pdf_path)
+        os.utime(cached)  # mark as recently used
+        return pdf_path
+
+    # Same bytes as `python generate_sN_handout.py --uuid ... > file` (print adds the
+    # final newline), without starting a fresh interpreter per scenario; for
+    # pdflatex one line follows the dumped preamble: the fixed trailer ID
+    gen = GENERATORS[s]
+    tex = gen.render_latex(gen.generate(uuid))
+    env = dict(os.environ)
+    if LATEX_ENGINE == "pdflatex":
+        tex = tex.replace(FMT_MARKER, f"{FMT_MARKER}\n\\pdftrailerid{{mengm0056-s{s}-{uuid}}}", 1)
+        env.update(SOURCE_DATE_EPOCH=PDF_SOURCE_DATE_EPOCH, FORCE_SOURCE_DATE="1")
+    tex_path = workdir / f"mengm0056_s{s}_handout.tex"
+    tex_path.write_text(tex + "\n", encoding="utf-8")
+    fmt = preamble_format(tex_path)
+    if fmt:
+        # Trailing separator keeps the default search path for the stock formats
+        env["TEXFORMATS"] = f"{FMT_DIR}{os.pathsep}"
+        try:
+            run_latex([f"-fmt={fmt}"], tex_path, env)
+        except LatexError as e:
+            # Only a format that failed to load (pdflatex stops before opening
+            # the .log) is worth a plain retry; a timeout or an error in the
+            # document itself would just fail again, and says nothing about
+            # the format the other handouts use
+            if e.timed_out or not e.no_log:
+                raise
+            # A format that is still there but will not load is not used again;
+            # one pruned from the cache in the meantime is dumped on next use
+            if (FMT_DIR / f"{fmt}.fmt").exists():
+                with _fmt_lock:
+                    _fmt_failed.add(fmt)
+            fmt = None
+    if not fmt:
+        run_latex([], tex_path, env)
+    store_cached_pdf(pdf_path, cached)
+    return pdf_path
+
+def build_and_publish(uuid: str):
+    try:
+        step = 0
+        set_status(uuid, stage="starting", step=step, total=TOTAL_STEPS, done=False, error=None, cached_url=None)
+
+        # If already published, finish immediately. Ask the Pages CDN first; the
+        # branch listing catches folders whose Pages build is not live yet.
+        published = uuid_live_on_pages(uuid)
+        if not published:
+            tree = list_tree(uuid)
+            published = uuid_folder_exists(uuid, tree)
+        if published:
+            set_status(uuid, stage="already_published", step=TOTAL_STEPS-1, done=True, pages_url=f"{PAGES_BASE}/{uuid}/")
+            return
 
-            step += 1; set_status(uuid, stage="upload_index", step=step)
-            upload_file(f"{uuid}/index.html", tmpdir / "index.html", commit_msg)
+        with tempfile.TemporaryDirectory(prefix=f"{uuid}_", dir=SCRATCH_DIR) as tmp:
+            tmpdir = Path(tmp)
 
-        # Trigger GitHub Pages build and wait until it is built
-        step += 1; set_status(uuid, stage="trigger_pages_build", step=step)
-        trigger_pages_build()
+            # Generate + compile all scenarios concurrently; each gets its own
+            # subdirectory so pdflatex aux files never collide
+            set_status(uuid, stage="build_scenarios", step=step)
+            pdfs = {}
+            with ThreadPoolExecutor(max_workers=len(SCENARIOS)) as pool:
+                futures = {pool.submit(build_scenario, uuid, s, tmpdir / f"s{s}"): s for s in SCENARIOS}
+                for fut in as_completed(futures):
+                    s = futures[fut]
+                    pdfs[s] = fut.result()
+                    step += 2; set_status(uuid, stage=f"built_s{s}", step=step)
+            # The PDFs are now in the local cache: the waiting room sends the
+            # user there while the upload and Pages build carry on
+            set_status(uuid, cached_url=f"/cached/{uuid}/")
 
-        step += 1; set_status(uuid, stage="pages_building", step=step)
-        status = wait_for_pages_build(max_seconds=PAGES_BUILD_TIMEOUT_S, poll_every=3)
-        if status == "errored":
-            set_status(uuid, done=True, error="GitHub Pages build failed", pages_url=None)
-            return
+            # Write per-UUID index.html
+            step += 1; set_status(uuid, stage="write_index", step=step)
+            (tmpdir / "index.html").write_text(index_html(uuid), encoding="utf-8")
+
+            # Upload PDFs and index to gh-pages/<uuid>/ as a single commit
+            step += 1; set_status(uuid, stage="upload", step=step)
+            local_files = [pdfs[s] for s in SCENARIOS] + [tmpdir / "index.html"]
+            files = dict(zip(published_paths(uuid), local_files))
+            committed = commit_files(files, f"Add scenario PDFs for {uuid}", tree)
+
+        # Trigger GitHub Pages build and wait until it is built (nothing to
+        # build when every file was already on the branch)
+        if committed:
+            step += 1; set_status(uuid, stage="trigger_pages_build", step=step)
+            trigger_pages_build()
+
+            step += 1; set_status(uuid, stage="pages_building", step=step)
+            status = wait_for_pages_build(max_seconds=PAGES_BUILD_TIMEOUT_S)
+            if status == "errored":
+                set_status(uuid, done=True, error="GitHub Pages build failed", pages_url=None)
+                return
+        else:
+            step += 2
 
         # Optional: wait for CDN propagation so the first GET does not 404
         pages_url = f"{PAGES_BASE}/{uuid}/"
         step += 1; set_status(uuid, stage="pages_propagating", step=step, pages_url=pages_url)
-        _ok = wait_for_url_200(pages_url, max_seconds=PAGES_PROPAGATE_TIMEOUT, poll_every=3)
+        _ok = wait_for_url_200(pages_url, max_seconds=PAGES_PROPAGATE_TIMEOUT)
 
         # Done
-        set_status(uuid, stage="done", step=total_steps, done=True, pages_url=pages_url, error=None)
+        set_status(uuid, stage="done", step=TOTAL_STEPS, done=True, pages_url=pages_url, error=None)
 
-    except subprocess.CalledProcessError as e:
+    except LatexError as e:
         set_status(uuid, done=True, error=f"Build error: {e}", pages_url=None)
     except Exception as e:
         set_status(uuid, done=True, error=f"Server error: {e}", pages_url=None)
 
+# -------- Build queue (fixed pool of worker threads) --------
+WORK_Q = queue.Queue()
+
+def _build_worker():
+    while True:
+        uuid = WORK_Q.get()
+        try:
+            build_and_publish(uuid)
+        finally:
+            WORK_Q.task_done()
+
+def queue_position(uuid) -> int:
+    # Number of builds waiting ahead of this one (0 once it is running)
+    with WORK_Q.mutex:
+        pending = list(WORK_Q.queue)
+    return pending.index(uuid) if uuid in pending else 0
+
+for _ in range(BUILD_WORKERS):
+    threading.Thread(target=_build_worker, daemon=True).start()
+threading.Thread(target=_cache_housekeeper, daemon=True).start()
+
 # -------- HTTP endpoints --------
+def clean_uuid(raw):
+    # Trimmed UUID, or None if it is not a canonical lower-case one
+    uuid = (raw or "").strip()
+    return uuid if UUID_RE.match(uuid) else None
+
 WAITING_ROOM_HTML = """<!doctype html>
 <meta charset="utf-8">
 <title>Building PDFs…</title>
@@ -210,6 +572,7 @@ WAITING_ROOM_HTML = """<!doctype html>
   .fill.err{background:#d32f2f}
   .muted{color:#666;font-size:.9rem}
   code{background:#f6f8fa;padding:.1rem .3rem;border-radius:4px}
+  #msg{white-space:pre-wrap;font-family:ui-monospace,monospace;font-size:.8rem}
 </style>
 <h1>Generating your scenario PDFs</h1>
 <p class="muted">UUID: <code id="u"></code></p>
@@ -223,70 +586,152 @@ const fill = document.getElementById('fill');
 const stage = document.getElementById('stage');
 const msg = document.getElementById('msg');
 const friendly = {
+  build_scenarios: "Generating and compiling scenario PDFs…",
   trigger_pages_build: "Triggering GitHub Pages build…",
   pages_building: "GitHub Pages is building your site…",
+  upload: "Uploading PDFs to GitHub…",
   pages_propagating: "Publishing complete; waiting for it to go live…"
 };
 
+// Renders one status update; returns true once there is nothing left to wait for
+function show(s){
+  if(s.error){
+    fill.className='fill err'; fill.style.width='100%';
+    stage.textContent = 'Error';
+    msg.textContent = s.error;
+    return true;
+  }
+  const total = s.total || 100;
+  const pct = Math.max(0, Math.min(100, Math.round(100*(s.step||0)/total)));
+  fill.className = 'fill ok';
+  fill.style.width = pct + '%';
+  let label = friendly[s.stage] || (s.stage ? `Stage: ${s.stage}` : 'Working…');
+  if(s.stage === 'queued' && s.ahead){
+    label = `Queued – ${s.ahead} ahead of you`;
+  }
+  stage.textContent = `${label} (${pct}%)`;
+  const url = (s.done && s.pages_url) || s.cached_url;
+  if(url){
+    stage.textContent = 'Done - opening your PDFs…';
+    setTimeout(()=>{ window.location.href = url; }, 600);
+    return true;
+  }
+  return false;
+}
+
+// Fallback: poll /status
 async function tick(){
   try{
     const r = await fetch(`/status?uuid=${encodeURIComponent(uuid)}&t=${Date.now()}`);
-    const s = await r.json();
-    if(s.error){
-      fill.className='fill err'; fill.style.width='100%';
-      stage.textContent = 'Error';
-      msg.textContent = s.error;
-      return;
-    }
-    const total = s.total || 100;
-    const pct = Math.max(0, Math.min(100, Math.round(100*(s.step||0)/total)));
-    fill.className = 'fill ok';
-    fill.style.width = pct + '%';
-    const label = friendly[s.stage] || (s.stage ? `Stage: ${s.stage}` : 'Working…');
-    stage.textContent = `${label} (${pct}%)`;
-    if(s.done && s.pages_url){
-      stage.textContent = 'Done - opening your PDFs…';
-      setTimeout(()=>{ window.location.href = s.pages_url; }, 600);
-      return;
-    }
+    if(show(await r.json())) return;
   }catch(e){ /* ignore; keep polling */ }
   setTimeout(tick, %(poll)s);
 }
-tick();
+
+// Preferred: server pushes each status change over SSE. If the stream errors,
+// or nothing arrives (e.g. a proxy buffering the response), switch to polling.
+function listen(){
+  const es = new EventSource(`/events?uuid=${encodeURIComponent(uuid)}`);
+  const toPolling = ()=>{ es.close(); tick(); };
+  let fallback = setTimeout(toPolling, 5000);
+  es.onmessage = (e)=>{
+    clearTimeout(fallback);
+    if(show(JSON.parse(e.data))) es.close();
+  };
+  es.onerror = ()=>{ clearTimeout(fallback); toPolling(); };
+}
+
+if(window.EventSource){ listen(); } else { tick(); }
 </script>
 """.replace("%(poll)s", str(int(POLL_INTERVAL_S*1000)))
+# The page has no server-side variables (the UUID is read client-side), so it
+# is encoded once here rather than passed through Jinja on every request
+WAITING_ROOM_BYTES = WAITING_ROOM_HTML.encode("utf-8")
 
 @app.get("/start")
 def start():
-    uuid = (request.args.get("uuid") or "").strip()
-    if not uuid or not re.fullmatch(r"[0-9a-fA-F-]{16,}", uuid):
+    uuid = clean_uuid(request.args.get("uuid"))
+    if not uuid:
         abort(400, "Missing/invalid uuid")
 
     s = get_status(uuid)
     # If first time or previous error, (re)kick the build
     if not s or (s.get("done") and not s.get("pages_url")):
-        total_steps = (len(SCENARIOS) * 3) + 4
-        set_status(uuid, stage="queued", step=0, total=total_steps, done=False, error=None)
-        threading.Thread(target=build_and_publish, args=(uuid,), daemon=True).start()
+        set_status(uuid, stage="queued", step=0, total=TOTAL_STEPS, done=False, error=None)
+        WORK_Q.put(uuid)
 
-    return render_template_string(WAITING_ROOM_HTML)
+    return WAITING_ROOM_BYTES, 200, {"Content-Type": "text/html; charset=utf-8"}
+
+def status_payload(uuid):
+    s = get_status(uuid)
+    if not s:
+        s = {"stage":"queued","step":0,"total":TOTAL_STEPS,"done":False}
+    if s.get("stage") == "queued":
+        s = {**s, "ahead": queue_position(uuid)}
+    return s
 
 @app.get("/status")
 def status():
-    uuid = (request.args.get("uuid") or "").strip()
+    uuid = clean_uuid(request.args.get("uuid"))
     if not uuid:
-        return jsonify({"error":"Missing uuid"}), 400
-    s = get_status(uuid)
-    if not s:
-        s = {"stage":"queued","step":0,"total":(len(SCENARIOS)*3 + 4),"done":False}
-    return jsonify(s)
+        return jsonify({"error":"Missing/invalid uuid"}), 400
+    return jsonify(status_payload(uuid))
+
+# Server-Sent Events: pushes the status whenever it changes, until done
+@app.get("/events")
+def events():
+    uuid = clean_uuid(request.args.get("uuid"))
+    if not uuid:
+        return jsonify({"error":"Missing/invalid uuid"}), 400
+
+    def stream():
+        seen, last = -1, None
+        while True:
+            # Any update wakes every listener, which also refreshes queue positions
+            with STATUS_CHANGED:
+                changed = STATUS_CHANGED.wait_for(lambda: STATUS_VERSION != seen, timeout=SSE_KEEPALIVE_S)
+                seen = STATUS_VERSION
+            if not changed:
+                yield ": keepalive\n\n"
+                continue
+            s = status_payload(uuid)
+            if s != last:
+                last = s
+                yield f"data: {json.dumps(s)}\n\n"
+                if s.get("done"):
+                    return
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# PDFs straight from the local cache, available as soon as they are compiled.
+# Anything not (or no longer) cached is sent on to the Pages copy.
+@app.get("/cached/<uuid>/")
+def cached_index(uuid):
+    if clean_uuid(uuid) != uuid:
+        abort(404)
+    if not all(cached_pdf_path(uuid, s).exists() for s in SCENARIOS):
+        return redirect(f"{PAGES_BASE}/{uuid}/", code=302)
+    return index_html(uuid), 200, {"Content-Type": "text/html; charset=utf-8"}
+
+@app.get("/cached/<uuid>/<filename>")
+def cached_pdf(uuid, filename):
+    m = re.fullmatch(r"mengm0056_s(\d+)_handout\.pdf", filename)
+    if not m or int(m.group(1)) not in SCENARIOS or clean_uuid(uuid) != uuid:
+        abort(404)
+    path = cached_pdf_path(uuid, int(m.group(1)))
+    if not path.exists():
+        return redirect(f"{PAGES_BASE}/{uuid}/{filename}", code=302)
+    # The cache key covers the generator version, so a cached file never changes
+    return send_file(path, mimetype="application/pdf", download_name=filename,
+                     conditional=True, etag=True, max_age=3600)
 
 # Backwards compatibility: /generate just sends to /start so users see progress
 @app.get("/generate")
 def generate_legacy():
-    uuid = (request.args.get("uuid") or "").strip()
+    uuid = clean_uuid(request.args.get("uuid"))
     if not uuid:
-        abort(400, "Missing uuid")
+        abort(400, "Missing/invalid uuid")
     return redirect(f"/start?uuid={uuid}", code=302)
 
 @app.get("/")
@@ -7,19 +7,26 @@ The same UUID always yields the same parameters.
 
 Usage:
   python generate_s1_handout.py --uuid <uuid-string> > mengm0056_s1_handout.tex
+  python generate_s1_handout.py --uuid-file roster.txt --out-dir build
+    (one lower-case UUID per line; writes build/<uuid>/mengm0056_s1_handout.tex,
+     other lines are reported on stderr and skipped)
 """
 
 import argparse
+import functools
 import hashlib
 import json
 import random
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass, fields
 from typing import Dict
 
+import handout_batch
+
 # ----------------------------
 # Data models
 # ----------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GlobalParams:
     shifts_per_day: int
     shift_length_hours: float
@@ -27,7 +34,7 @@ class GlobalParams:
     demand_cv: float
     on_time_target: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StationParams:
     count: int
     cycle_time_s: float
@@ -38,18 +45,18 @@ class StationParams:
     rework_time_s: float = None
     rework_success: float = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReliabilityParams:
     mtbf_min: float
     mttr_min: float
     arrival_jitter_cv: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostsParams:
     scrap_cost_per_unit: float
     rework_labour_cost_per_hour: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioParams:
     uuid: str
     global_params: GlobalParams
@@ -66,17 +73,35 @@ class ScenarioParams:
 # ----------------------------
 # Deterministic RNG utilities
 # ----------------------------
-def make_rng(seed_text: str) -> random.Random:
-    digest = hashlib.sha256(seed_text.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)  # stable 32-bit seed
-    return random.Random(seed)
+# The seed derivation and the Mersenne Twister stream are part of the
+# hand-out's contract: switching either (e.g. to PCG64) would silently change
+# the parameters and checksum of every UUID already issued.
+def make_rng(seed_text, rng: random.Random = None) -> random.Random:
+    # seed_text may already be UTF-8 bytes, which are hashed as they are
+    if isinstance(seed_text, str):
+        seed_text = seed_text.encode("utf-8")
+    digest = hashlib.sha256(seed_text).digest()
+    seed = int.from_bytes(digest[:4], "big")  # stable 32-bit seed (first 8 hex digits)
+    if rng is None:
+        return random.Random(seed)
+    # Reseeding gives exactly the stream a fresh Random(seed) would
+    rng.seed(seed)
+    return rng
 
 def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2) -> float:
     x = lo + (hi - lo) * rng.random()
     return round(x, decimals)
 
 def seeded_int(rng: random.Random, lo: int, hi: int) -> int:
-    return rng.randint(lo, hi)
+    # Bit-masked rejection sampling: the same getrandbits() calls, and so the
+    # same values, as rng.randint(lo, hi), without randint -> randrange ->
+    # _randbelow and their argument checks
+    n = hi - lo + 1
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return lo + r
 
 def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 4) -> float:
     x = lo + (hi - lo) * rng.random()
@@ -84,102 +109,114 @@ def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 4) ->
     return round(x, decimals)
 
 # ----------------------------
-# Parameter generation
+# Checksum serialisation
 # ----------------------------
-def generate(uuid_text: str) -> ScenarioParams:
-    uuid_text = uuid_text.strip()
-    rng = make_rng(uuid_text)
-
-    # Global
-    g = GlobalParams(
-        shifts_per_day=2,
-        shift_length_hours=7.5,
-        demand_nominal_per_day=seeded_int(rng, 900, 1400),
-        demand_cv=seeded_uniform(rng, 0.08, 0.22, 3),
-        on_time_target=0.95
-    )
+@functools.lru_cache(maxsize=None)
+def _sorted_fields(cls) -> tuple:
+    return tuple(sorted(f.name for f in fields(cls)))
 
-    # Stations
-    smt = StationParams(
-        count=seeded_int(rng, 1, 3),
-        cycle_time_s=seeded_uniform(rng, 24.0, 36.0, 1),
-        fpy=bounded_prob(rng, 0.985, 0.998, 4)
-    )
-    camera = StationParams(
-        count=seeded_int(rng, 1, 2),
-        cycle_time_s=seeded_uniform(rng, 35.0, 55.0, 1),
-        defect_rate=bounded_prob(rng, 0.015, 0.040, 4)
-    )
-    ict = StationParams(
-        count=seeded_int(rng, 1, 2),
-        cycle_time_s=seeded_uniform(rng, 70.0, 110.0, 1),
-        detect_prob=bounded_prob(rng, 0.85, 0.98, 3)
-    )
-    fin = StationParams(
-        count=seeded_int(rng, 1, 3),
-        cycle_time_s=seeded_uniform(rng, 55.0, 85.0, 1),
-        fpy=bounded_prob(rng, 0.97, 0.995, 4)
-    )
-    ft = StationParams(
-        count=seeded_int(rng, 4, 8),  # slots
-        cycle_time_s=seeded_uniform(rng, 90.0, 150.0, 1),
-        false_fail=bounded_prob(rng, 0.002, 0.010, 4)
-    )
-    rework = StationParams(
-        count=1,
-        cycle_time_s=seeded_uniform(rng, 90.0, 180.0, 1),
-        rework_success=bounded_prob(rng, 0.70, 0.92, 3)
-    )
+def canonical_json(obj) -> str:
+    # json.dumps(asdict(obj), sort_keys=True) for a dataclass of scalar fields:
+    # ints and floats use repr (as json does), None is null
+    items = []
+    for name in _sorted_fields(type(obj)):
+        v = getattr(obj, name)
+        items.append(f'"{name}": {"null" if v is None else repr(v)}')
+    return "{" + ", ".join(items) + "}"
 
+# ----------------------------
+# Parameter generation
+# ----------------------------
+# Every seeded parameter as (group, field, kind, *draw args), in the order the
+# values are drawn from the RNG. The order is part of the seeding contract:
+# reordering rows changes every hand-out.
+_SCHEMA = (
+    ("global_params", "demand_nominal_per_day", "int", 900, 1400),
+    ("global_params", "demand_cv", "uniform", 0.08, 0.22, 3),
+    # Stations
+    ("smt", "count", "int", 1, 3),
+    ("smt", "cycle_time_s", "uniform", 24.0, 36.0, 1),
+    ("smt", "fpy", "prob", 0.985, 0.998, 4),
+    ("camera_align", "count", "int", 1, 2),
+    ("camera_align", "cycle_time_s", "uniform", 35.0, 55.0, 1),
+    ("camera_align", "defect_rate", "prob", 0.015, 0.040, 4),
+    ("ict", "count", "int", 1, 2),
+    ("ict", "cycle_time_s", "uniform", 70.0, 110.0, 1),
+    ("ict", "detect_prob", "prob", 0.85, 0.98, 3),
+    ("final_assembly", "count", "int", 1, 3),
+    ("final_assembly", "cycle_time_s", "uniform", 55.0, 85.0, 1),
+    ("final_assembly", "fpy", "prob", 0.97, 0.995, 4),
+    ("ft", "count", "int", 4, 8),  # slots
+    ("ft", "cycle_time_s", "uniform", 90.0, 150.0, 1),
+    ("ft", "false_fail", "prob", 0.002, 0.010, 4),
+    ("rework", "cycle_time_s", "uniform", 90.0, 180.0, 1),
+    ("rework", "rework_success", "prob", 0.70, 0.92, 3),
     # Reliability
-    rel = {
-        "SMT": ReliabilityParams(
-            mtbf_min=seeded_uniform(rng, 240.0, 480.0, 1),
-            mttr_min=seeded_uniform(rng, 8.0, 25.0, 1),
-            arrival_jitter_cv=seeded_uniform(rng, 0.05, 0.12, 3)
-        ),
-        "Alignment": ReliabilityParams(
-            mtbf_min=seeded_uniform(rng, 180.0, 360.0, 1),
-            mttr_min=seeded_uniform(rng, 6.0, 18.0, 1),
-            arrival_jitter_cv=seeded_uniform(rng, 0.05, 0.12, 3)
-        ),
-        "ICT": ReliabilityParams(
-            mtbf_min=seeded_uniform(rng, 220.0, 420.0, 1),
-            mttr_min=seeded_uniform(rng, 8.0, 20.0, 1),
-            arrival_jitter_cv=seeded_uniform(rng, 0.05, 0.12, 3)
-        ),
-        "FinalAssembly": ReliabilityParams(
-            mtbf_min=seeded_uniform(rng, 200.0, 400.0, 1),
-            mttr_min=seeded_uniform(rng, 7.0, 20.0, 1),
-            arrival_jitter_cv=seeded_uniform(rng, 0.05, 0.12, 3)
-        ),
-        "FT": ReliabilityParams(
-            mtbf_min=seeded_uniform(rng, 260.0, 520.0, 1),
-            mttr_min=seeded_uniform(rng, 10.0, 25.0, 1),
-            arrival_jitter_cv=seeded_uniform(rng, 0.05, 0.12, 3)
-        ),
-    }
-
-    costs = CostsParams(
-        scrap_cost_per_unit=seeded_uniform(rng, 18.0, 35.0, 2),
-        rework_labour_cost_per_hour=seeded_uniform(rng, 18.0, 28.0, 2)
-    )
+    ("SMT", "mtbf_min", "uniform", 240.0, 480.0, 1),
+    ("SMT", "mttr_min", "uniform", 8.0, 25.0, 1),
+    ("SMT", "arrival_jitter_cv", "uniform", 0.05, 0.12, 3),
+    ("Alignment", "mtbf_min", "uniform", 180.0, 360.0, 1),
+    ("Alignment", "mttr_min", "uniform", 6.0, 18.0, 1),
+    ("Alignment", "arrival_jitter_cv", "uniform", 0.05, 0.12, 3),
+    ("ICT", "mtbf_min", "uniform", 220.0, 420.0, 1),
+    ("ICT", "mttr_min", "uniform", 8.0, 20.0, 1),
+    ("ICT", "arrival_jitter_cv", "uniform", 0.05, 0.12, 3),
+    ("FinalAssembly", "mtbf_min", "uniform", 200.0, 400.0, 1),
+    ("FinalAssembly", "mttr_min", "uniform", 7.0, 20.0, 1),
+    ("FinalAssembly", "arrival_jitter_cv", "uniform", 0.05, 0.12, 3),
+    ("FT", "mtbf_min", "uniform", 260.0, 520.0, 1),
+    ("FT", "mttr_min", "uniform", 10.0, 25.0, 1),
+    ("FT", "arrival_jitter_cv", "uniform", 0.05, 0.12, 3),
+    # Costs
+    ("costs", "scrap_cost_per_unit", "uniform", 18.0, 35.0, 2),
+    ("costs", "rework_labour_cost_per_hour", "uniform", 18.0, 28.0, 2),
+)
+# Parameters that are not seeded
+_FIXED = {
+    "global_params": {"shifts_per_day": 2, "shift_length_hours": 7.5, "on_time_target": 0.95},
+    "rework": {"count": 1},
+}
+RELIABILITY_KEYS = ("SMT", "Alignment", "ICT", "FinalAssembly", "FT")
+_DRAW = {"int": seeded_int, "uniform": seeded_uniform, "prob": bounded_prob}
+
+def draw_params(rng: random.Random) -> dict:
+    # group -> {field: value}, ready to pass to the dataclass constructors
+    vals = {group: dict(fixed) for group, fixed in _FIXED.items()}
+    for group, name, kind, *args in _SCHEMA:
+        vals.setdefault(group, {})[name] = _DRAW[kind](rng, *args)
+    return vals
+
+def generate(uuid_text: str, rng: random.Random = None) -> ScenarioParams:
+    uuid_text = uuid_text.strip()
+    rng = make_rng(uuid_text, rng)
+
+    vals = draw_params(rng)
+    g = GlobalParams(**vals["global_params"])
+    smt = StationParams(**vals["smt"])
+    camera = StationParams(**vals["camera_align"])
+    ict = StationParams(**vals["ict"])
+    fin = StationParams(**vals["final_assembly"])
+    ft = StationParams(**vals["ft"])
+    rework = StationParams(**vals["rework"])
+    rel = {k: ReliabilityParams(**vals[k]) for k in RELIABILITY_KEYS}
+    costs = CostsParams(**vals["costs"])
 
-    # Checksum for verification (short hash of full JSON params excluding checksum)
-    tmp = {
-        "uuid": uuid_text,
-        "global_params": asdict(g),
-        "smt": asdict(smt),
-        "camera_align": asdict(camera),
-        "ict": asdict(ict),
-        "final_assembly": asdict(fin),
-        "ft": asdict(ft),
-        "rework": asdict(rework),
-        "reliability": {k: asdict(v) for k, v in rel.items()},
-        "costs": asdict(costs),
-    }
-    blob = json.dumps(tmp, sort_keys=True).encode("utf-8")
-    checksum = hashlib.sha256(blob).hexdigest()[:12]
+    # Checksum for verification (short hash of full JSON params excluding checksum).
+    # The text is exactly json.dumps(..., sort_keys=True) of those params,
+    # written out directly with the top-level keys already in sorted order.
+    blob = "".join((
+        '{"camera_align": ', canonical_json(camera),
+        ', "costs": ', canonical_json(costs),
+        ', "final_assembly": ', canonical_json(fin),
+        ', "ft": ', canonical_json(ft),
+        ', "global_params": ', canonical_json(g),
+        ', "ict": ', canonical_json(ict),
+        ', "reliability": {', ", ".join(f'"{k}": {canonical_json(rel[k])}' for k in sorted(rel)),
+        '}, "rework": ', canonical_json(rework),
+        ', "smt": ', canonical_json(smt),
+        ', "uuid": ', json.dumps(uuid_text), '}',
+    )).encode("utf-8")
+    checksum = hashlib.sha256(blob).digest()[:6].hex()  # == hexdigest()[:12]
 
     return ScenarioParams(
         uuid=uuid_text,
@@ -195,157 +232,206 @@ def generate(uuid_text: str) -> ScenarioParams:
         checksum=checksum
     )
 
+def generate_many(uuid_texts) -> list:
+    # Batch form of generate(): one Mersenne Twister is reseeded per UUID
+    # instead of allocating a new generator state for each
+    rng = random.Random()
+    return [generate(u, rng) for u in uuid_texts]
+
 # ----------------------------
 # LaTeX rendering
 # ----------------------------
+# One pass over the text; since each character is replaced only once, the
+# backslashes introduced by the other escapes are never escaped again
+_TEX_TABLE = str.maketrans({
+    "\\": "\\textbackslash{}",
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+})
+
 def tex_escape(s: str) -> str:
-    return (s.replace("&", "\\&")
-             .replace("%", "\\%")
-             .replace("$", "\\$")
-             .replace("#", "\\#")
-             .replace("_", "\\_")
-             .replace("{", "\\{")
-             .replace("}", "\\}")
-             .replace("~", "\\textasciitilde{}")
-             .replace("^", "\\textasciicircum{}")
-             .replace("\\", "\\textbackslash{}"))
+    return s.translate(_TEX_TABLE)
 
-def render_latex(p: ScenarioParams) -> str:
-    g = p.global_params
-    # Begin document
-    lines = []
-    lines.append(r"\documentclass[11pt,a4paper]{article}")
-    lines.append(r"\usepackage[margin=2.5cm,landscape]{geometry}")
-    lines.append(r"\usepackage{booktabs}")
-    lines.append(r"\usepackage{siunitx}")
-    lines.append(r"\usepackage{enumitem}")
-    lines.append(r"\usepackage[hidelinks]{hyperref}")
-    lines.append(r"\usepackage{caption}")
-    lines.append(r"\usepackage{longtable}")
-    lines.append(r"\sisetup{detect-all=true}")
-    lines.append("")
-    lines.append(r"\setlist[itemize]{nosep}")
-    lines.append(r"\setlist[enumerate]{nosep}")
-    lines.append("")
-    lines.append(r"\title{MENGM0056 - Product and Production Systems\\Scenario 1: Smartphone Sub-assembly Line}")
-    lines.append(r"\author{Hand-out for Group Coursework (2025/26)}")
-    lines.append(r"\date{}")
-    lines.append(r"\begin{document}")
-    lines.append(r"\maketitle")
-    lines.append("")
-    lines.append(r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum)
-    lines.append("")
-    lines.append(r"\section*{Purpose}")
-    lines.append(r"This scenario simulates decision-making in a mid-volume consumer-electronics sub-assembly factory. Your group receives a fixed baseline design (resources, cycle times, defect and failure characteristics, and demand). You will identify improvement opportunities, select appropriate KPIs, choose and apply techniques from the unit, and justify your proposed changes to management.")
-    lines.append("")
-    lines.append(r"\section*{Narrative}")
-    lines.append(r"A contract manufacturer assembles a mid-range smartphone. Quality issues around camera alignment and intermittent congestion at functional test have been observed during promotional spikes. Demand is expected to grow. Capital expenditure is constrained; process and policy changes are preferred.")
-    lines.append("")
-    lines.append(r"\section*{Entities and flow (fixed structure)}")
-    lines.append(r"PCB population (SMT) $\rightarrow$ Camera module build \& alignment $\rightarrow$ In-circuit test (ICT) $\rightarrow$ Final assembly \& seal $\rightarrow$ Functional test (FT) $\rightarrow$ Pack.")
-    lines.append("")
-    lines.append(r"\section*{Baseline parameters (seeded)}")
-    # Global table
-    lines.append(r"\subsection*{Global}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Shifts per day & {g.shifts_per_day} \\")
-    lines.append(rf"Shift length & {g.shift_length_hours}~h \\")
-    lines.append(rf"Demand (nominal) & {g.demand_nominal_per_day}~units/day \\")
-    lines.append(rf"Demand CV & {g.demand_cv} \\")
-    lines.append(rf"On-time target & {int(g.on_time_target*100)}\% \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Station table
-    lines.append(r"\subsection*{Stations}")
-    lines.append(r"\begin{tabular}{@{}lllll@{}}")
-    lines.append(r"\toprule")
-    lines.append(r"\textbf{Resource} & \textbf{Count} & \textbf{Time} & \textbf{Quality} & \textbf{Notes} \\")
-    lines.append(r"\midrule")
-    lines.append(rf"SMT lines & {p.smt.count} & {p.smt.cycle_time_s}~s/board & FPY {p.smt.fpy} & Parallel lines \\")
-    lines.append(rf"Camera alignment cells & {p.camera_align.count} & {p.camera_align.cycle_time_s}~s/unit & Defect {p.camera_align.defect_rate} & Rework permitted \\")
-    lines.append(rf"ICT bays & {p.ict.count} & {p.ict.cycle_time_s}~s/unit & Detect {p.ict.detect_prob} & Serial/parallel as per count \\")
-    lines.append(rf"Final assembly cells & {p.final_assembly.count} & {p.final_assembly.cycle_time_s}~s/unit & FPY {p.final_assembly.fpy} & Manual with jigs \\")
-    lines.append(rf"FT rack slots & {p.ft.count} & {p.ft.cycle_time_s}~s/unit & False fail {p.ft.false_fail} & Parallel slots; queueing \\")
-    lines.append(rf"Rework station(s) & {p.rework.count} & {p.rework.cycle_time_s}~s/unit & Success {p.rework.rework_success} & From alignment/ICT \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Reliability
-    lines.append(r"\subsection*{Reliability and logistics}")
-    lines.append(r"\begin{tabular}{@{}llll@{}}")
-    lines.append(r"\toprule Resource & MTBF (min) & MTTR (min) & Arrival jitter CV \\")
-    lines.append(r"\midrule")
-    for k, v in p.reliability.items():
-        lines.append(rf"{k} & {v.mtbf_min} & {v.mttr_min} & {v.arrival_jitter_cv} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Costs
-    lines.append(r"\subsection*{Costs}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Scrap cost per unit & \pounds {p.costs.scrap_cost_per_unit} \\")
-    lines.append(rf"Rework labour cost per hour & \pounds {p.costs.rework_labour_cost_per_hour} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
+# Static text of the document, joined once at import: the preamble, the
+# narrative sections before the parameter tables, and everything after them
+_PREAMBLE = "\n".join((
+    r"\documentclass[11pt,a4paper]{article}",
+    r"\usepackage[margin=2.5cm,landscape]{geometry}",
+    r"\usepackage{booktabs}",
+    r"\usepackage{siunitx}",
+    r"\usepackage{enumitem}",
+    # Everything above is shared by all scenarios and can be dumped into a
+    # pdflatex format (mylatexformat); \relax when compiled normally
+    r"\csname endofdump\endcsname",
+    r"\usepackage[hidelinks]{hyperref}",
+    r"\usepackage{caption}",
+    r"\usepackage{longtable}",
+    r"\sisetup{detect-all=true}",
+    "",
+    r"\setlist[itemize]{nosep}",
+    r"\setlist[enumerate]{nosep}",
+    "",
+    r"\title{MENGM0056 - Product and Production Systems\\Scenario 1: Smartphone Sub-assembly Line}",
+    r"\author{Hand-out for Group Coursework (2025/26)}",
+    r"\date{}",
+    r"\begin{document}",
+    r"\maketitle",
+    "",
+)) + "\n"
+
+_INTRO = "\n".join((
+    "",
+    r"\section*{Purpose}",
+    r"This scenario simulates decision-making in a mid-volume consumer-electronics sub-assembly factory. Your group receives a fixed baseline design (resources, cycle times, defect and failure characteristics, and demand). You will identify improvement opportunities, select appropriate KPIs, choose and apply techniques from the unit, and justify your proposed changes to management.",
+    "",
+    r"\section*{Narrative}",
+    r"A contract manufacturer assembles a mid-range smartphone. Quality issues around camera alignment and intermittent congestion at functional test have been observed during promotional spikes. Demand is expected to grow. Capital expenditure is constrained; process and policy changes are preferred.",
+    "",
+    r"\section*{Entities and flow (fixed structure)}",
+    r"PCB population (SMT) $\rightarrow$ Camera module build \& alignment $\rightarrow$ In-circuit test (ICT) $\rightarrow$ Final assembly \& seal $\rightarrow$ Functional test (FT) $\rightarrow$ Pack.",
+    "",
+    r"\section*{Baseline parameters (seeded)}",
+)) + "\n"
+
+_STATIC_TAIL = "\n".join((
     # KPIs
-    lines.append(r"\section*{Required KPIs}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item First-pass yield (FPY) by station and rolled throughput yield (RTY).")
-    lines.append(r"\item Throughput (units/day), on-time delivery probability, and average lead time.")
-    lines.append(r"\item Work-in-progress (WIP) before FT and maximum queue length at FT.")
-    lines.append(r"\item Rework rate and rework hours/day; scrap cost per unit.")
-    lines.append(r"\end{itemize}")
+    r"\section*{Required KPIs}",
+    r"\begin{itemize}",
+    r"\item First-pass yield (FPY) by station and rolled throughput yield (RTY).",
+    r"\item Throughput (units/day), on-time delivery probability, and average lead time.",
+    r"\item Work-in-progress (WIP) before FT and maximum queue length at FT.",
+    r"\item Rework rate and rework hours/day; scrap cost per unit.",
+    r"\end{itemize}",
     # Techniques
-    lines.append(r"\section*{Techniques to apply (choose appropriately)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item \textbf{Modelling \& KPIs}: KPI definitions, RTY ladder, capacity calculations.")
-    lines.append(r"\item \textbf{CAE}: Camera alignment jig/tolerance stack-up if you propose design changes affecting quality or time.")
-    lines.append(r"\item \textbf{Mathematical programming}: Staffing and test-bay/slot scheduling; buffer sizing under constraints.")
-    lines.append(r"\item \textbf{Uncertainty modelling}: Demand, defect, test time variability, breakdowns; Monte Carlo assessment of service level.")
-    lines.append(r"\item \textbf{Simulation}: Discrete-event simulation of the line (bottlenecks and rework loop). Agent-based modelling is optional if human-cobot interactions are relevant.")
-    lines.append(r"\item \textbf{Metaheuristic optimisation}: Parameter tuning for conflicting objectives (e.g., reduce defect rate without increasing cycle time beyond takt).")
-    lines.append(r"\end{itemize}")
+    r"\section*{Techniques to apply (choose appropriately)}",
+    r"\begin{itemize}",
+    r"\item \textbf{Modelling \& KPIs}: KPI definitions, RTY ladder, capacity calculations.",
+    r"\item \textbf{CAE}: Camera alignment jig/tolerance stack-up if you propose design changes affecting quality or time.",
+    r"\item \textbf{Mathematical programming}: Staffing and test-bay/slot scheduling; buffer sizing under constraints.",
+    r"\item \textbf{Uncertainty modelling}: Demand, defect, test time variability, breakdowns; Monte Carlo assessment of service level.",
+    r"\item \textbf{Simulation}: Discrete-event simulation of the line (bottlenecks and rework loop). Agent-based modelling is optional if human-cobot interactions are relevant.",
+    r"\item \textbf{Metaheuristic optimisation}: Parameter tuning for conflicting objectives (e.g., reduce defect rate without increasing cycle time beyond takt).",
+    r"\end{itemize}",
     # Levers
-    lines.append(r"\section*{Improvement levers (examples, not exhaustive)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Realignment of staffing across ICT and FT; time-of-day pooling of testers.")
-    lines.append(r"\item Buffer policy revision to avoid blocking before FT.")
-    lines.append(r"\item Tolerance/jig updates informed by CAE to cut alignment defects.")
-    lines.append(r"\item Preventive maintenance intervals to reduce micro-stoppages at FT.")
-    lines.append(r"\item Rework routing policies (thresholds for scrap vs. rework).")
-    lines.append(r"\end{itemize}")
+    r"\section*{Improvement levers (examples, not exhaustive)}",
+    r"\begin{itemize}",
+    r"\item Realignment of staffing across ICT and FT; time-of-day pooling of testers.",
+    r"\item Buffer policy revision to avoid blocking before FT.",
+    r"\item Tolerance/jig updates informed by CAE to cut alignment defects.",
+    r"\item Preventive maintenance intervals to reduce micro-stoppages at FT.",
+    r"\item Rework routing policies (thresholds for scrap vs. rework).",
+    r"\end{itemize}",
     # Deliverables
-    lines.append(r"\section*{Deliverables}")
-    lines.append(r"\begin{enumerate}")
-    lines.append(r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).")
-    lines.append(r"\item The report should include an executive summary for senior management.")
-    lines.append(r"\item Model files (e.g., simulation, optimisation) as appendices/evidence.")
-    lines.append(r"\end{enumerate}")
+    r"\section*{Deliverables}",
+    r"\begin{enumerate}",
+    r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).",
+    r"\item The report should include an executive summary for senior management.",
+    r"\item Model files (e.g., simulation, optimisation) as appendices/evidence.",
+    r"\end{enumerate}",
     # Assessment
-    lines.append(r"\section*{Assessment emphasis}")
-    lines.append(r"Clarity of problem framing and KPI choice; correctness and transparency of models; appropriateness of technique selection; quality of experimental design; depth of analysis; and persuasiveness of recommendations given operational constraints.")
+    r"\section*{Assessment emphasis}",
+    r"Clarity of problem framing and KPI choice; correctness and transparency of models; appropriateness of technique selection; quality of experimental design; depth of analysis; and persuasiveness of recommendations given operational constraints.",
     # Reproducibility
-    lines.append(r"\section*{Data ethics and reproducibility}")
-    lines.append(r"Report your UUID seed and any random seeds used within tools to ensure reproducibility. State assumptions clearly.")
-    lines.append("")
-    lines.append(r"\end{document}")
-    return "\n".join(lines)
+    r"\section*{Data ethics and reproducibility}",
+    r"Report your UUID seed and any random seeds used within tools to ensure reproducibility. State assumptions clearly.",
+    "",
+    r"\end{document}",
+))
+
+# The four parameter tables as one str.format template (LaTeX braces doubled),
+# so all the seeded values are substituted in a single call
+_TABLES = "\n".join((
+    # Global table
+    r"\subsection*{{Global}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Shifts per day & {g.shifts_per_day} \\",
+    r"Shift length & {g.shift_length_hours}~h \\",
+    r"Demand (nominal) & {g.demand_nominal_per_day}~units/day \\",
+    r"Demand CV & {g.demand_cv} \\",
+    r"On-time target & {on_time_pct}\% \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Station table
+    r"\subsection*{{Stations}}",
+    r"\begin{{tabular}}{{@{{}}lllll@{{}}}}",
+    r"\toprule",
+    r"\textbf{{Resource}} & \textbf{{Count}} & \textbf{{Time}} & \textbf{{Quality}} & \textbf{{Notes}} \\",
+    r"\midrule",
+    r"SMT lines & {p.smt.count} & {p.smt.cycle_time_s}~s/board & FPY {p.smt.fpy} & Parallel lines \\",
+    r"Camera alignment cells & {p.camera_align.count} & {p.camera_align.cycle_time_s}~s/unit & Defect {p.camera_align.defect_rate} & Rework permitted \\",
+    r"ICT bays & {p.ict.count} & {p.ict.cycle_time_s}~s/unit & Detect {p.ict.detect_prob} & Serial/parallel as per count \\",
+    r"Final assembly cells & {p.final_assembly.count} & {p.final_assembly.cycle_time_s}~s/unit & FPY {p.final_assembly.fpy} & Manual with jigs \\",
+    r"FT rack slots & {p.ft.count} & {p.ft.cycle_time_s}~s/unit & False fail {p.ft.false_fail} & Parallel slots; queueing \\",
+    r"Rework station(s) & {p.rework.count} & {p.rework.cycle_time_s}~s/unit & Success {p.rework.rework_success} & From alignment/ICT \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Reliability
+    r"\subsection*{{Reliability and logistics}}",
+    r"\begin{{tabular}}{{@{{}}llll@{{}}}}",
+    r"\toprule Resource & MTBF (min) & MTTR (min) & Arrival jitter CV \\",
+    r"\midrule",
+    "{reliability_rows}",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Costs
+    r"\subsection*{{Costs}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Scrap cost per unit & \pounds {p.costs.scrap_cost_per_unit} \\",
+    r"Rework labour cost per hour & \pounds {p.costs.rework_labour_cost_per_hour} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+)) + "\n"
+_RELIABILITY_ROW = r"{k} & {v.mtbf_min} & {v.mttr_min} & {v.arrival_jitter_cv} \\"
+
+def render_latex(p: ScenarioParams) -> str:
+    # Static text is precomputed; only the UUID line and the tables vary
+    g = p.global_params
+    reliability_rows = "\n".join([_RELIABILITY_ROW.format(k=k, v=v) for k, v in p.reliability.items()])
+    return "".join((
+        _PREAMBLE,
+        r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum + "\n",
+        _INTRO,
+        _TABLES.format(p=p, g=g, on_time_pct=int(g.on_time_target*100), reliability_rows=reliability_rows),
+        _STATIC_TAIL,
+    ))
 
 # ----------------------------
 # Main
 # ----------------------------
+def _render_one(uuid_text: str):
+    params = generate(uuid_text)
+    return params.uuid, render_latex(params)
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--uuid", required=True, help="UUID string (any version).")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--uuid", help="UUID string (any version).")
+    src.add_argument("--uuid-file", help="File with one UUID per line (batch mode).")
+    ap.add_argument("--out-dir", default=".", help="Batch mode output directory (default: current).")
     args = ap.parse_args()
 
+    if args.uuid_file:
+        sys.exit(handout_batch.run(_render_one, args.uuid_file, args.out_dir, "mengm0056_s1_handout.tex"))
+
     params = generate(args.uuid)
     tex = render_latex(params)
-    print(tex)
+    # One UTF-8 encode of the whole document straight to the byte stream,
+    # with the trailing newline print() used to add
+    sys.stdout.buffer.write(tex.encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
     main()
@@ -10,16 +10,18 @@ Usage:
 """
 
 import argparse
+import functools
 import hashlib
 import json
 import random
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass, fields
 from typing import Dict
 
 # ----------------------------
 # Data models
 # ----------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GlobalParams:
     shifts_per_day: int
     shift_length_hours: float
@@ -27,7 +29,7 @@ class GlobalParams:
     demand_cv: float                   # coefficient of variation for weekly orders
     sustainability_focus: str          # textual flag to steer student emphasis
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StationParams:
     count: int
     cycle_time_s: float = None         # or process time representative per part
@@ -37,7 +39,7 @@ class StationParams:
     detect_prob: float = None          # NDT detection probability
     rework_time_s: float = None        # per part if applicable
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnergyParams:
     kwh_per_part_casting: float
     kwh_per_part_machining: float
@@ -47,7 +49,7 @@ class EnergyParams:
     peak_start_hour: int
     peak_end_hour: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MaterialParams:
     net_mass_kg: float
     gating_runners_kg: float
@@ -55,12 +57,12 @@ class MaterialParams:
     alloy_price_per_kg: float
     scrap_recovery_per_kg: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReliabilityParams:
     mtbf_min: float
     mttr_min: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostsParams:
     ndt_cost_per_part: float
     coolant_cost_per_part: float
@@ -68,7 +70,7 @@ class CostsParams:
     rework_labour_cost_per_hour: float
     environmental_cost_per_kwh_p: float  # pence per kWh equivalent carbon cost
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioParams:
     uuid: str
     global_params: GlobalParams
@@ -87,32 +89,76 @@ class ScenarioParams:
 # ----------------------------
 # Deterministic RNG utilities
 # ----------------------------
-def make_rng(seed_text: str) -> random.Random:
-    digest = hashlib.sha256(seed_text.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)  # stable 32-bit seed
-    return random.Random(seed)
+# The seed derivation and the Mersenne Twister stream are part of the
+# hand-out's contract: switching either (e.g. seeding Random with the UUID
+# text directly) would silently change the parameters and checksum of every
+# UUID already issued.
+def make_rng(seed_text: str, rng: random.Random = None) -> random.Random:
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    seed = int.from_bytes(digest[:4], "big")  # stable 32-bit seed (first 8 hex digits)
+    if rng is None:
+        return random.Random(seed)
+    # Reseeding gives exactly the stream a fresh Random(seed) would
+    rng.seed(seed)
+    return rng
 
 def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2) -> float:
     x = lo + (hi - lo) * rng.random()
     return round(x, decimals)
 
 def seeded_int(rng: random.Random, lo: int, hi: int) -> int:
-    return rng.randint(lo, hi)
-
-def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 4) -> float:
-    x = lo + (hi - lo) * rng.random()
-    x = max(0.0, min(1.0, x))
-    return round(x, decimals)
+    # Bit-masked rejection sampling: the same getrandbits() calls, and so the
+    # same values, as rng.randint(lo, hi), without randint -> randrange ->
+    # _randbelow and their argument checks
+    n = hi - lo + 1
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return lo + r
 
 def choose(rng: random.Random, options):
-    return options[seeded_int(rng, 0, len(options)-1)]
+    # Same draw as rng.randrange(len(options)), inlined like seeded_int()
+    n = len(options)
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return options[r]
+
+# Fixed option sets for choose()
+_SUSTAIN_OPTS = ("energy", "scrap", "both")
+_PEAK_START = (15, 16, 17)
+_PEAK_END = (18, 19, 20)
+
+# ----------------------------
+# Checksum serialisation
+# ----------------------------
+@functools.lru_cache(maxsize=None)
+def _sorted_fields(cls) -> tuple:
+    return tuple(sorted(f.name for f in fields(cls)))
+
+def canonical_json(obj) -> str:
+    # json.dumps(asdict(obj), sort_keys=True) for a dataclass of scalar fields:
+    # numbers use repr (as json does), strings are JSON-escaped, None is null
+    items = []
+    for name in _sorted_fields(type(obj)):
+        v = getattr(obj, name)
+        if v is None:
+            v = "null"
+        elif isinstance(v, str):
+            v = json.dumps(v)
+        else:
+            v = repr(v)
+        items.append(f'"{name}": {v}')
+    return "{" + ", ".join(items) + "}"
 
 # ----------------------------
 # Parameter generation
 # ----------------------------
-def generate(uuid_text: str) -> ScenarioParams:
+def generate(uuid_text: str, rng: random.Random = None) -> ScenarioParams:
     uuid_text = uuid_text.strip()
-    rng = make_rng(uuid_text)
+    rng = make_rng(uuid_text, rng)
 
     # Global parameters
     global_params = GlobalParams(
@@ -120,9 +166,7 @@ def generate(uuid_text: str) -> ScenarioParams:
         shift_length_hours=7.5,
         weekly_output_target=seeded_int(rng, 4200, 5600),  # good parts per week
         demand_cv=seeded_uniform(rng, 0.06, 0.18, 3),
-        sustainability_focus=choose(rng, [
-            "energy", "scrap", "both"
-        ])
+        sustainability_focus=choose(rng, _SUSTAIN_OPTS)
     )
 
     # Stations and process characteristics
@@ -130,14 +174,14 @@ def generate(uuid_text: str) -> ScenarioParams:
     casting = StationParams(
         count=seeded_int(rng, 2, 4),
         cycle_time_s=seeded_uniform(rng, 170.0, 240.0, 1),  # 2.8-4.0 min
-        scrap_rate=bounded_prob(rng, 0.03, 0.09, 4)          # station scrap at casting
+        scrap_rate=seeded_uniform(rng, 0.03, 0.09, 4)        # station scrap at casting
     )
 
     # X-ray NDT
     ndt = StationParams(
         count=seeded_int(rng, 1, 2),
         cycle_time_s=seeded_uniform(rng, 70.0, 120.0, 1),
-        detect_prob=bounded_prob(rng, 0.92, 0.99, 3),
+        detect_prob=seeded_uniform(rng, 0.92, 0.99, 3),
         rework_time_s=seeded_uniform(rng, 240.0, 480.0, 0)   # triage and repair path
     )
 
@@ -152,7 +196,7 @@ def generate(uuid_text: str) -> ScenarioParams:
     cnc = StationParams(
         count=seeded_int(rng, 5, 8),
         cycle_time_s=seeded_uniform(rng, 380.0, 520.0, 0),   # per part combined rough+finish
-        scrap_rate=bounded_prob(rng, 0.004, 0.012, 4)
+        scrap_rate=seeded_uniform(rng, 0.004, 0.012, 4)
     )
 
     # Washing
@@ -165,7 +209,7 @@ def generate(uuid_text: str) -> ScenarioParams:
     cmm = StationParams(
         count=seeded_int(rng, 1, 2),
         cycle_time_s=seeded_uniform(rng, 540.0, 780.0, 0),   # 9-13 min
-        scrap_rate=bounded_prob(rng, 0.0, 0.002, 4)          # late discovery risk
+        scrap_rate=seeded_uniform(rng, 0.0, 0.002, 4)        # late discovery risk
     )
 
     # Energy parameters
@@ -175,8 +219,8 @@ def generate(uuid_text: str) -> ScenarioParams:
         kwh_per_part_heat_treat=seeded_uniform(rng, 1.6, 2.8, 2),
         peak_tariff_p_per_kwh=seeded_uniform(rng, 32.0, 52.0, 1),
         offpeak_tariff_p_per_kwh=seeded_uniform(rng, 18.0, 28.0, 1),
-        peak_start_hour=choose(rng, [15, 16, 17]),
-        peak_end_hour=choose(rng, [18, 19, 20])
+        peak_start_hour=choose(rng, _PEAK_START),
+        peak_end_hour=choose(rng, _PEAK_END)
     )
 
     # Material parameters
@@ -221,22 +265,22 @@ def generate(uuid_text: str) -> ScenarioParams:
         environmental_cost_per_kwh_p=seeded_uniform(rng, 1.2, 3.6, 1)  # pence/kWh as carbon proxy
     )
 
-    # Checksum for verification
-    tmp = {
-        "uuid": uuid_text,
-        "global_params": asdict(global_params),
-        "casting": asdict(casting),
-        "ndt": asdict(ndt),
-        "heat_treat": asdict(heat_treat),
-        "cnc": asdict(cnc),
-        "washing": asdict(washing),
-        "cmm": asdict(cmm),
-        "energy": asdict(energy),
-        "material": asdict(material),
-        "reliability": {k: asdict(v) for k, v in reliability.items()},
-        "costs": asdict(costs),
-    }
-    blob = json.dumps(tmp, sort_keys=True).encode("utf-8")
+    # Checksum for verification. The text is exactly json.dumps(..., sort_keys=True)
+    # of the params, written out directly with the top-level keys in sorted order.
+    blob = "".join((
+        '{"casting": ', canonical_json(casting),
+        ', "cmm": ', canonical_json(cmm),
+        ', "cnc": ', canonical_json(cnc),
+        ', "costs": ', canonical_json(costs),
+        ', "energy": ', canonical_json(energy),
+        ', "global_params": ', canonical_json(global_params),
+        ', "heat_treat": ', canonical_json(heat_treat),
+        ', "material": ', canonical_json(material),
+        ', "ndt": ', canonical_json(ndt),
+        ', "reliability": {', ", ".join(f'"{k}": {canonical_json(reliability[k])}' for k in sorted(reliability)),
+        '}, "uuid": ', json.dumps(uuid_text),
+        ', "washing": ', canonical_json(washing), '}',
+    )).encode("utf-8")
     checksum = hashlib.sha256(blob).hexdigest()[:12]
 
     return ScenarioParams(
@@ -255,182 +299,241 @@ def generate(uuid_text: str) -> ScenarioParams:
         checksum=checksum
     )
 
+def generate_many(uuid_texts) -> list:
+    # Batch form of generate(): one Mersenne Twister is reseeded per UUID
+    # instead of allocating a new generator state for each
+    rng = random.Random()
+    return [generate(u, rng) for u in uuid_texts]
+
 # ----------------------------
 # LaTeX rendering
 # ----------------------------
+# One pass over the text; since each character is replaced only once, the
+# backslashes introduced by the other escapes are never escaped again
+_TEX_TABLE = str.maketrans({
+    "\\": "\\textbackslash{}",
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+})
+
+# Only ever applied to the UUID and the three sustainability_focus values, so
+# in batch runs the latter are always cache hits
+@functools.lru_cache(maxsize=256)
 def tex_escape(s: str) -> str:
-    return (s.replace("&", "\\&")
-             .replace("%", "\\%")
-             .replace("$", "\\$")
-             .replace("#", "\\#")
-             .replace("_", "\\_")
-             .replace("{", "\\{")
-             .replace("}", "\\}")
-             .replace("~", "\\textasciitilde{}")
-             .replace("^", "\\textasciicircum{}")
-             .replace("\\", "\\textbackslash{}"))
-
-def render_latex(p: ScenarioParams) -> str:
-    g = p.global_params
-    e = p.energy
-    m = p.material
+    return s.translate(_TEX_TABLE)
+
+# Static text of the document, joined once at import and written out as is:
+# the preamble, the narrative sections before the parameter tables, and
+# everything after them
+_PREAMBLE = "\n".join((
+    r"\documentclass[11pt,a4paper]{article}",
+    r"\usepackage[margin=2.5cm,landscape]{geometry}",
+    r"\usepackage{booktabs}",
+    r"\usepackage{siunitx}",
+    r"\usepackage{enumitem}",
+    # Everything above is shared by all scenarios and can be dumped into a
+    # pdflatex format (mylatexformat); \relax when compiled normally
+    r"\csname endofdump\endcsname",
+    r"\usepackage[hidelinks]{hyperref}",
+    r"\usepackage{caption}",
+    r"\usepackage{longtable}",
+    r"\sisetup{detect-all=true}",
+    "",
+    r"\setlist[itemize]{nosep}",
+    r"\setlist[enumerate]{nosep}",
+    "",
+    r"\title{MENGM0056 - Product and Production Systems\\Scenario 2: Automotive Components - Aluminium Gearbox Casings}",
+    r"\author{Hand-out for Group Coursework (2025/26)}",
+    r"\date{}",
+    r"\begin{document}",
+    r"\maketitle",
+    "",
+)) + "\n"
+
+_INTRO = "\n".join((
+    "",
+    r"\section*{Purpose}",
+    r"This scenario simulates a cast-and-machine workflow for aluminium gearbox casings. Your group receives seeded baseline parameters and must propose improvements that reduce cost and environmental impact while maintaining the weekly output target and quality.",
+    "",
+    r"\section*{Narrative}",
+    r"Aluminium and energy prices have risen, and new environmental performance reporting requires reductions in both scrap and energy per good part. Production capacity must be maintained to satisfy weekly orders. Capital expenditure is constrained in the short term, so parameter, policy, and scheduling changes are preferred.",
+    "",
+    r"\section*{Entities and flow (fixed structure)}",
+    r"Gravity die casting $\rightarrow$ X-ray NDT $\rightarrow$ Heat treatment $\rightarrow$ CNC rough/finish $\rightarrow$ Washing $\rightarrow$ Coordinate-measuring machine (CMM) $\rightarrow$ Pack.",
+    "",
+    r"\section*{Baseline parameters (seeded)}",
+)) + "\n"
+
+_POSTAMBLE = "\n".join((
+    # KPIs
+    r"\section*{Required KPIs}",
+    r"\begin{itemize}",
+    r"\item Scrap percentage by stage and rolled throughput yield (RTY).",
+    r"\item Energy consumption per good part, and energy cost per good part.",
+    r"\item Material utilisation: net mass divided by total poured, and alloy cost per good part.",
+    r"\item Weekly throughput and on-time completion against the weekly output target.",
+    r"\item CMM queue time and heat treatment oven utilisation.",
+    r"\end{itemize}",
+    # Techniques
+    r"\section*{Techniques to apply}",
+    r"\begin{itemize}",
+    r"\item \textbf{Modelling \& KPIs}: RTY ladder; energy and material balance per good part.",
+    r"\item \textbf{CAE}: Casting gating and riser changes; distortion risk and machining allowance sensitivity.",
+    r"\item \textbf{Mathematical programming}: Oven batch sizing and start-time scheduling to avoid peak tariffs; CNC assignment and shift planning.",
+    r"\item \textbf{Uncertainty modelling}: Demand variability; breakdown distributions; defect modes and NDT detection uncertainty.",
+    r"\item \textbf{Metaheuristic optimisation}: Multi-parameter process window search for casting temperatures, die temperatures, and shot speeds under yield and cycle constraints.",
+    r"\item \textbf{Simulation}: Discrete-event simulation for bottlenecks at CMM and ovens; evaluate queueing and batch policies.",
+    r"\end{itemize}",
+    # Levers
+    r"\section*{Improvement levers (examples, not exhaustive)}",
+    r"\begin{itemize}",
+    r"\item Shift oven starts to minimise time in peak tariff windows while protecting weekly output.",
+    r"\item Modify gating and riser design to cut porosity and reduce machining allowances.",
+    r"\item Balance CNC routing based on cycle spread; consider dynamic assignment to reduce queues.",
+    r"\item Introduce NDT triage rules for repairability to prevent non-valuable rework.",
+    r"\item Implement scrap segregation to maximise recovery value.",
+    r"\end{itemize}",
+    # Deliverables
+    r"\section*{Deliverables}",
+    r"\begin{enumerate}",
+    r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).",
+    r"\item The report should include a weekly production plan demonstrating compliance with the output target and tariff policy.",
+    r"\item Model files (e.g., simulation, optimisation, CAE) as appendices or evidence.",
+    r"\end{enumerate}",
+    # Assessment
+    r"\section*{Assessment emphasis}",
+    r"Sound KPI selection and modelling; correctness and transparency of calculations; appropriate choice of techniques; quality of experimental design; depth of analysis on scrap and energy; and clear, defensible recommendations that meet operational constraints.",
+    # Reproducibility
+    r"\section*{Data ethics and reproducibility}",
+    r"Report your UUID seed and any random seeds used within tools. Include enough detail to allow independent regeneration of your parameter tables.",
+    "",
+    r"\end{document}",
+))
 
-    lines = []
-    lines.append(r"\documentclass[11pt,a4paper]{article}")
-    lines.append(r"\usepackage[margin=2.5cm,landscape]{geometry}")
-    lines.append(r"\usepackage{booktabs}")
-    lines.append(r"\usepackage{siunitx}")
-    lines.append(r"\usepackage{enumitem}")
-    lines.append(r"\usepackage[hidelinks]{hyperref}")
-    lines.append(r"\usepackage{caption}")
-    lines.append(r"\usepackage{longtable}")
-    lines.append(r"\sisetup{detect-all=true}")
-    lines.append("")
-    lines.append(r"\setlist[itemize]{nosep}")
-    lines.append(r"\setlist[enumerate]{nosep}")
-    lines.append("")
-    lines.append(r"\title{MENGM0056 - Product and Production Systems\\Scenario 2: Automotive Components - Aluminium Gearbox Casings}")
-    lines.append(r"\author{Hand-out for Group Coursework (2025/26)}")
-    lines.append(r"\date{}")
-    lines.append(r"\begin{document}")
-    lines.append(r"\maketitle")
-    lines.append("")
-    lines.append(r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum)
-    lines.append("")
-    lines.append(r"\section*{Purpose}")
-    lines.append(r"This scenario simulates a cast-and-machine workflow for aluminium gearbox casings. Your group receives seeded baseline parameters and must propose improvements that reduce cost and environmental impact while maintaining the weekly output target and quality.")
-    lines.append("")
-    lines.append(r"\section*{Narrative}")
-    lines.append(r"Aluminium and energy prices have risen, and new environmental performance reporting requires reductions in both scrap and energy per good part. Production capacity must be maintained to satisfy weekly orders. Capital expenditure is constrained in the short term, so parameter, policy, and scheduling changes are preferred.")
-    lines.append("")
-    lines.append(r"\section*{Entities and flow (fixed structure)}")
-    lines.append(r"Gravity die casting $\rightarrow$ X-ray NDT $\rightarrow$ Heat treatment $\rightarrow$ CNC rough/finish $\rightarrow$ Washing $\rightarrow$ Coordinate-measuring machine (CMM) $\rightarrow$ Pack.")
-    lines.append("")
-    lines.append(r"\section*{Baseline parameters (seeded)}")
+_UUID_LINE = r"\noindent \textbf{{UUID seed:}} {uuid_esc} \quad \textbf{{Checksum:}} {p.checksum}" + "\n"
 
+# The parameter tables as one str.format template (LaTeX braces doubled); only
+# the seeded values and the few derived strings below are substituted per call
+_TABLES = "\n".join((
     # Global
-    lines.append(r"\subsection*{Global}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Shifts per day & {g.shifts_per_day} \\")
-    lines.append(rf"Shift length & {g.shift_length_hours}~h \\")
-    lines.append(rf"Weekly output target & {g.weekly_output_target}~good~parts/week \\")
-    lines.append(rf"Weekly demand CV & {g.demand_cv} \\")
-    lines.append(rf"Sustainability emphasis & {tex_escape(g.sustainability_focus)} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Global}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Shifts per day & {g.shifts_per_day} \\",
+    r"Shift length & {g.shift_length_hours}~h \\",
+    r"Weekly output target & {g.weekly_output_target}~good~parts/week \\",
+    r"Weekly demand CV & {g.demand_cv} \\",
+    r"Sustainability emphasis & {focus_esc} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Stations
-    lines.append(r"\subsection*{Stations and process timings}")
-    lines.append(r"\begin{tabular}{@{}lllll@{}}")
-    lines.append(r"\toprule")
-    lines.append(r"\textbf{Stage} & \textbf{Count} & \textbf{Time} & \textbf{Quality} & \textbf{Notes} \\")
-    lines.append(r"\midrule")
-    lines.append(rf"Casting cells & {p.casting.count} & {p.casting.cycle_time_s}~s/part & Scrap {p.casting.scrap_rate} & Gravity die casting \\")
-    lines.append(rf"X-ray NDT & {p.ndt.count} & {p.ndt.cycle_time_s}~s/part & Detect {p.ndt.detect_prob} & Rework path {p.ndt.rework_time_s}~s if repairable \\")
-    if p.heat_treat.batch_size and p.heat_treat.batch_time_min:
-        lines.append(rf"Heat treatment oven & {p.heat_treat.count} & {p.heat_treat.batch_time_min}~min/batch & - & Batch size {p.heat_treat.batch_size} parts \\")
-    lines.append(rf"CNC machining centres & {p.cnc.count} & {p.cnc.cycle_time_s}~s/part & Scrap {p.cnc.scrap_rate} & Combined rough and finish \\")
-    lines.append(rf"Washing & {p.washing.count} & {p.washing.cycle_time_s}~s/part & - & Deburr and wash \\")
-    lines.append(rf"CMM inspection & {p.cmm.count} & {p.cmm.cycle_time_s}~s/part & Scrap {p.cmm.scrap_rate} & Late discovery risk \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Stations and process timings}}",
+    r"\begin{{tabular}}{{@{{}}lllll@{{}}}}",
+    r"\toprule",
+    r"\textbf{{Stage}} & \textbf{{Count}} & \textbf{{Time}} & \textbf{{Quality}} & \textbf{{Notes}} \\",
+    r"\midrule",
+    r"Casting cells & {p.casting.count} & {p.casting.cycle_time_s}~s/part & Scrap {p.casting.scrap_rate} & Gravity die casting \\",
+    r"X-ray NDT & {p.ndt.count} & {p.ndt.cycle_time_s}~s/part & Detect {p.ndt.detect_prob} & Rework path {p.ndt.rework_time_s}~s if repairable \\",
+    r"{heat_treat_row}CNC machining centres & {p.cnc.count} & {p.cnc.cycle_time_s}~s/part & Scrap {p.cnc.scrap_rate} & Combined rough and finish \\",
+    r"Washing & {p.washing.count} & {p.washing.cycle_time_s}~s/part & - & Deburr and wash \\",
+    r"CMM inspection & {p.cmm.count} & {p.cmm.cycle_time_s}~s/part & Scrap {p.cmm.scrap_rate} & Late discovery risk \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Materials and energy
-    lines.append(r"\subsection*{Materials and energy}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Net casting mass & {m.net_mass_kg}~kg \\")
-    lines.append(rf"Gating and runners & {m.gating_runners_kg}~kg \\")
-    lines.append(rf"Recoverable yield from gating & {int(m.recoverable_yield*100)}\% \\")
-    lines.append(rf"Alloy price & \pounds {m.alloy_price_per_kg}~/kg \\")
-    lines.append(rf"Scrap recovery value & \pounds {m.scrap_recovery_per_kg}~/kg \\")
-    lines.append(r"\midrule")
-    lines.append(rf"Casting energy & {e.kwh_per_part_casting}~kWh/part \\")
-    lines.append(rf"Machining energy & {e.kwh_per_part_machining}~kWh/part \\")
-    lines.append(rf"Heat treatment energy & {e.kwh_per_part_heat_treat}~kWh/part \\")
-    lines.append(rf"Tariff off-peak & {e.offpeak_tariff_p_per_kwh}~p/kWh \\")
-    lines.append(rf"Tariff peak & {e.peak_tariff_p_per_kwh}~p/kWh \\")
-    lines.append(rf"Peak window & {e.peak_start_hour}:00\,--\,{e.peak_end_hour}:00 \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Materials and energy}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Net casting mass & {m.net_mass_kg}~kg \\",
+    r"Gating and runners & {m.gating_runners_kg}~kg \\",
+    r"Recoverable yield from gating & {recoverable_pct}\% \\",
+    r"Alloy price & \pounds {m.alloy_price_per_kg}~/kg \\",
+    r"Scrap recovery value & \pounds {m.scrap_recovery_per_kg}~/kg \\",
+    r"\midrule",
+    r"Casting energy & {e.kwh_per_part_casting}~kWh/part \\",
+    r"Machining energy & {e.kwh_per_part_machining}~kWh/part \\",
+    r"Heat treatment energy & {e.kwh_per_part_heat_treat}~kWh/part \\",
+    r"Tariff off-peak & {e.offpeak_tariff_p_per_kwh}~p/kWh \\",
+    r"Tariff peak & {e.peak_tariff_p_per_kwh}~p/kWh \\",
+    r"Peak window & {e.peak_start_hour}:00\,--\,{e.peak_end_hour}:00 \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Reliability
-    lines.append(r"\subsection*{Reliability}")
-    lines.append(r"\begin{tabular}{@{}lll@{}}")
-    lines.append(r"\toprule Resource & MTBF (min) & MTTR (min) \\")
-    lines.append(r"\midrule")
-    for k, v in p.reliability.items():
-        lines.append(rf"{k} & {v.mtbf_min} & {v.mttr_min} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Reliability}}",
+    r"\begin{{tabular}}{{@{{}}lll@{{}}}}",
+    r"\toprule Resource & MTBF (min) & MTTR (min) \\",
+    r"\midrule",
+    # generate() always builds these five families, in this order
+    r"Furnace & {r[Furnace].mtbf_min} & {r[Furnace].mttr_min} \\",
+    r"CastingCell & {r[CastingCell].mtbf_min} & {r[CastingCell].mttr_min} \\",
+    r"Oven & {r[Oven].mtbf_min} & {r[Oven].mttr_min} \\",
+    r"CNC & {r[CNC].mtbf_min} & {r[CNC].mttr_min} \\",
+    r"CMM & {r[CMM].mtbf_min} & {r[CMM].mttr_min} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Costs
-    lines.append(r"\subsection*{Costs}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"X-ray NDT imaging cost & \pounds {p.costs.ndt_cost_per_part}~/part \\")
-    lines.append(rf"Coolant and consumables & \pounds {p.costs.coolant_cost_per_part}~/part \\")
-    lines.append(rf"Labour cost & \pounds {p.costs.labour_cost_per_hour}~/h \\")
-    lines.append(rf"Rework labour cost & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\")
-    lines.append(rf"Environmental cost proxy & {p.costs.environmental_cost_per_kwh_p}~p/kWh \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
-    # KPIs
-    lines.append(r"\section*{Required KPIs}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Scrap percentage by stage and rolled throughput yield (RTY).")
-    lines.append(r"\item Energy consumption per good part, and energy cost per good part.")
-    lines.append(r"\item Material utilisation: net mass divided by total poured, and alloy cost per good part.")
-    lines.append(r"\item Weekly throughput and on-time completion against the weekly output target.")
-    lines.append(r"\item CMM queue time and heat treatment oven utilisation.")
-    lines.append(r"\end{itemize}")
-
-    # Techniques
-    lines.append(r"\section*{Techniques to apply}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item \textbf{Modelling \& KPIs}: RTY ladder; energy and material balance per good part.")
-    lines.append(r"\item \textbf{CAE}: Casting gating and riser changes; distortion risk and machining allowance sensitivity.")
-    lines.append(r"\item \textbf{Mathematical programming}: Oven batch sizing and start-time scheduling to avoid peak tariffs; CNC assignment and shift planning.")
-    lines.append(r"\item \textbf{Uncertainty modelling}: Demand variability; breakdown distributions; defect modes and NDT detection uncertainty.")
-    lines.append(r"\item \textbf{Metaheuristic optimisation}: Multi-parameter process window search for casting temperatures, die temperatures, and shot speeds under yield and cycle constraints.")
-    lines.append(r"\item \textbf{Simulation}: Discrete-event simulation for bottlenecks at CMM and ovens; evaluate queueing and batch policies.")
-    lines.append(r"\end{itemize}")
-
-    # Levers
-    lines.append(r"\section*{Improvement levers (examples, not exhaustive)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Shift oven starts to minimise time in peak tariff windows while protecting weekly output.")
-    lines.append(r"\item Modify gating and riser design to cut porosity and reduce machining allowances.")
-    lines.append(r"\item Balance CNC routing based on cycle spread; consider dynamic assignment to reduce queues.")
-    lines.append(r"\item Introduce NDT triage rules for repairability to prevent non-valuable rework.")
-    lines.append(r"\item Implement scrap segregation to maximise recovery value.")
-    lines.append(r"\end{itemize}")
+    r"\subsection*{{Costs}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"X-ray NDT imaging cost & \pounds {p.costs.ndt_cost_per_part}~/part \\",
+    r"Coolant and consumables & \pounds {p.costs.coolant_cost_per_part}~/part \\",
+    r"Labour cost & \pounds {p.costs.labour_cost_per_hour}~/h \\",
+    r"Rework labour cost & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\",
+    r"Environmental cost proxy & {p.costs.environmental_cost_per_kwh_p}~p/kWh \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+)) + "\n"
+
+# Optional Stations row; carries its own newline so nothing is left when absent
+_HEAT_TREAT_ROW = r"Heat treatment oven & {p.heat_treat.count} & {p.heat_treat.batch_time_min}~min/batch & - & Batch size {p.heat_treat.batch_size} parts \\" + "\n"
+
+def _template_fields(p: ScenarioParams) -> dict:
+    g = p.global_params
+    m = p.material
+    heat_treat_row = _HEAT_TREAT_ROW.format(p=p) if p.heat_treat.batch_size and p.heat_treat.batch_time_min else ""
+    return dict(
+        p=p, g=g, e=p.energy, m=m, r=p.reliability,
+        uuid_esc=tex_escape(p.uuid),
+        focus_esc=tex_escape(g.sustainability_focus),
+        recoverable_pct=int(m.recoverable_yield*100),
+        heat_treat_row=heat_treat_row,
+    )
 
-    # Deliverables
-    lines.append(r"\section*{Deliverables}")
-    lines.append(r"\begin{enumerate}")
-    lines.append(r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).")
-    lines.append(r"\item The report should include a weekly production plan demonstrating compliance with the output target and tariff policy.")
-    lines.append(r"\item Model files (e.g., simulation, optimisation, CAE) as appendices or evidence.")
-    lines.append(r"\end{enumerate}")
+# The static blocks, encoded once at import
+_PREAMBLE_UTF8 = _PREAMBLE.encode("utf-8")
+_INTRO_UTF8 = _INTRO.encode("utf-8")
+_POSTAMBLE_UTF8 = _POSTAMBLE.encode("utf-8")
+
+def _utf8_pieces(p: ScenarioParams):
+    # The document as UTF-8 chunks, in order; render_latex() joins them and
+    # write_latex() streams them, so the assembly lives only here
+    values = _template_fields(p)
+    yield _PREAMBLE_UTF8
+    yield _UUID_LINE.format_map(values).encode("utf-8")
+    yield _INTRO_UTF8
+    yield _TABLES.format_map(values).encode("utf-8")
+    yield _POSTAMBLE_UTF8
 
-    # Assessment
-    lines.append(r"\section*{Assessment emphasis}")
-    lines.append(r"Sound KPI selection and modelling; correctness and transparency of calculations; appropriate choice of techniques; quality of experimental design; depth of analysis on scrap and energy; and clear, defensible recommendations that meet operational constraints.")
+def render_latex(p: ScenarioParams) -> str:
+    return b"".join(_utf8_pieces(p)).decode("utf-8")
 
-    # Reproducibility
-    lines.append(r"\section*{Data ethics and reproducibility}")
-    lines.append(r"Report your UUID seed and any random seeds used within tools. Include enough detail to allow independent regeneration of your parameter tables.")
-    lines.append("")
-    lines.append(r"\end{document}")
-    return "\n".join(lines)
+def write_latex(p: ScenarioParams, out) -> None:
+    # Writes the document and a final newline as UTF-8 to a binary stream such
+    # as sys.stdout.buffer, piece by piece rather than as one joined string
+    for piece in _utf8_pieces(p):
+        out.write(piece)
+    out.write(b"\n")
 
 # ----------------------------
 # Main
@@ -440,9 +543,8 @@ def main():
     ap.add_argument("--uuid", required=True, help="UUID string (any version).")
     args = ap.parse_args()
 
-    params = generate(args.uuid)
-    tex = render_latex(params)
-    print(tex)
+    write_latex(generate(args.uuid), sys.stdout.buffer)
+    sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
     main()
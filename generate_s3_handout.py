@@ -11,16 +11,20 @@ Usage:
 """
 
 import argparse
+import functools
 import hashlib
 import json
+import pickle
 import random
-from dataclasses import dataclass, asdict
-from typing import Dict
+import sys
+import threading
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Tuple
 
 # ----------------------------
 # Data models
 # ----------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GlobalParams:
     shifts_per_day: int
     shift_length_hours: float
@@ -29,26 +33,26 @@ class GlobalParams:
     sku_count: int                        # number of SKUs/flavours
     service_level_target: float           # on-time despatch target (e.g., 0.95)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LineParams:
     count: int
     rate_bph: int                         # nominal bottles per hour per machine/line
     availability: float                   # effective availability factor (0-1)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PackerParams:
     count: int
     case_rate_cph: int                    # cases per hour per machine
     availability: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChangeoverParams:
     cip_min: int                          # clean-in-place duration (flavour)
     flavour_change_min: int               # additional operations for syrup change
     label_change_min: int                 # label roll/artwork change only
     min_batch_cases: int                  # minimum run size to justify change
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogisticsParams:
     loading_bays: int
     despatch_start_hour: int              # e.g., 7
@@ -58,19 +62,19 @@ class LogisticsParams:
     cases_per_pallet: int
     pallets_per_truck: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReliabilityParams:
     mtbf_min: float
     mttr_min: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostsParams:
     holding_cost_per_pallet_day: float    # £/pallet/day
     changeover_cost_per_event: float      # £ per changeover (materials, QA, waste)
     lateness_penalty_per_truck: float     # £ penalty per late truck/order
     scrap_cost_per_case: float            # £/case for product scrapped in changeovers/CIP losses
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioParams:
     uuid: str
     global_params: GlobalParams
@@ -81,39 +85,108 @@ class ScenarioParams:
     palletiser: PackerParams
     changeover: ChangeoverParams
     logistics: LogisticsParams
-    reliability: Dict[str, ReliabilityParams]
+    reliability: Tuple[Tuple[str, ReliabilityParams], ...]  # (name, params) pairs in draw order
     costs: CostsParams
     checksum: str
 
+    @property
+    def reliability_map(self) -> Dict[str, ReliabilityParams]:
+        # Name-keyed view of the reliability pairs, built fresh on each call
+        return dict(self.reliability)
+
 # ----------------------------
 # Deterministic RNG utilities
 # ----------------------------
-def make_rng(seed_text: str) -> random.Random:
-    digest = hashlib.sha256(seed_text.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)  # stable 32-bit seed
-    return random.Random(seed)
+# The seed is part of the handout contract: every UUID already issued maps to
+# its parameters and checksum through the first 32 bits of SHA-256, so the
+# hash (and the Mersenne Twister it seeds) must not change.
+def make_rng(seed_text: str, rng: random.Random = None) -> random.Random:
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    seed = int.from_bytes(digest[:4], "big")  # stable 32-bit seed (first 8 hex digits)
+    if rng is None:
+        return random.Random(seed)
+    # Reseeding gives exactly the stream a fresh Random(seed) would
+    rng.seed(seed)
+    return rng
 
 def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2) -> float:
     x = lo + (hi - lo) * rng.random()
     return round(x, decimals)
 
 def seeded_int(rng: random.Random, lo: int, hi: int) -> int:
-    return rng.randint(lo, hi)
-
-def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 3) -> float:
-    x = lo + (hi - lo) * rng.random()
-    x = max(0.0, min(1.0, x))
-    return round(x, decimals)
+    # Bit-masked rejection sampling: the same getrandbits() calls, and so the
+    # same values, as rng.randint(lo, hi), without randint -> randrange ->
+    # _randbelow and their argument checks
+    n = hi - lo + 1
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return lo + r
 
 def choose(rng: random.Random, options):
-    return options[seeded_int(rng, 0, len(options) - 1)]
+    # Same draw as rng.randrange(len(options)), inlined like seeded_int()
+    n = len(options)
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return options[r]
+
+# Fixed option set for choose()
+_CASES_PER_PALLET = (72, 84, 96, 108)
+
+# ----------------------------
+# Checksum serialisation
+# ----------------------------
+@functools.lru_cache(maxsize=None)
+def _sorted_fields(cls) -> tuple:
+    return tuple(sorted(f.name for f in fields(cls)))
+
+def canonical_json(obj) -> str:
+    # json.dumps(asdict(obj), sort_keys=True) for a dataclass of scalar fields:
+    # numbers use repr (as json does), strings are JSON-escaped, None is null
+    items = []
+    for name in _sorted_fields(type(obj)):
+        v = getattr(obj, name)
+        if v is None:
+            v = "null"
+        elif isinstance(v, str):
+            v = json.dumps(v)
+        else:
+            v = repr(v)
+        items.append(f'"{name}": {v}')
+    return "{" + ", ".join(items) + "}"
 
 # ----------------------------
 # Parameter generation
 # ----------------------------
+# One Mersenne Twister per thread, reseeded by each generate() cache miss;
+# app.py builds scenarios from a thread pool, so a single shared one would race
+_local = threading.local()
+
+# Results are shared between callers with the same UUID, so they are frozen
+# and hold only immutable values (reliability is a tuple of name/params pairs)
+@functools.lru_cache(maxsize=256)
 def generate(uuid_text: str) -> ScenarioParams:
     uuid_text = uuid_text.strip()
-    rng = make_rng(uuid_text)
+    rng = getattr(_local, "rng", None)
+    if rng is None:
+        rng = _local.rng = random.Random()
+    return _draw(uuid_text, make_rng(uuid_text, rng))
+
+def generate_many(uuid_texts) -> list:
+    # Batch form of generate(): one Mersenne Twister is reseeded per UUID
+    # instead of allocating a new generator state for each. Bypasses the
+    # cache, which would only be evicted by a large batch anyway
+    rng = random.Random()
+    out = []
+    for u in uuid_texts:
+        u = u.strip()
+        out.append(_draw(u, make_rng(u, rng)))
+    return out
+
+def _draw(uuid_text: str, rng: random.Random) -> ScenarioParams:
 
     # Global assumptions
     global_params = GlobalParams(
@@ -167,7 +240,7 @@ def generate(uuid_text: str) -> ScenarioParams:
         despatch_end_hour=seeded_int(rng, 18, 20),
         truck_interarrival_mean_min=seeded_int(rng, 35, 75),
         truck_service_min=seeded_int(rng, 35, 60),
-        cases_per_pallet=choose(rng, [72, 84, 96, 108]),
+        cases_per_pallet=choose(rng, _CASES_PER_PALLET),
         pallets_per_truck=seeded_int(rng, 24, 30)
     )
 
@@ -203,22 +276,22 @@ def generate(uuid_text: str) -> ScenarioParams:
         scrap_cost_per_case=seeded_uniform(rng, 1.0, 2.0, 2)             # £/case (product + packaging)
     )
 
-    # Checksum for quick verification
-    tmp = {
-        "uuid": uuid_text,
-        "global_params": asdict(global_params),
-        "blow_moulder": asdict(blow_moulder),
-        "filler": asdict(filler),
-        "labeller": asdict(labeller),
-        "packer": asdict(packer),
-        "palletiser": asdict(palletiser),
-        "changeover": asdict(changeover),
-        "logistics": asdict(logistics),
-        "reliability": {k: asdict(v) for k, v in reliability.items()},
-        "costs": asdict(costs),
-    }
-    blob = json.dumps(tmp, sort_keys=True).encode("utf-8")
-    checksum = hashlib.sha256(blob).hexdigest()[:12]
+    # Checksum for quick verification. The text is exactly json.dumps(..., sort_keys=True)
+    # of the params, written out directly with the top-level keys in sorted order.
+    blob = "".join((
+        '{"blow_moulder": ', canonical_json(blow_moulder),
+        ', "changeover": ', canonical_json(changeover),
+        ', "costs": ', canonical_json(costs),
+        ', "filler": ', canonical_json(filler),
+        ', "global_params": ', canonical_json(global_params),
+        ', "labeller": ', canonical_json(labeller),
+        ', "logistics": ', canonical_json(logistics),
+        ', "packer": ', canonical_json(packer),
+        ', "palletiser": ', canonical_json(palletiser),
+        ', "reliability": {', ", ".join(f'"{k}": {canonical_json(reliability[k])}' for k in sorted(reliability)),
+        '}, "uuid": ', json.dumps(uuid_text), '}',
+    )).encode("utf-8")
+    checksum = hashlib.sha256(blob).digest()[:6].hex()  # == hexdigest()[:12]
 
     return ScenarioParams(
         uuid=uuid_text,
@@ -230,7 +303,7 @@ def generate(uuid_text: str) -> ScenarioParams:
         palletiser=palletiser,
         changeover=changeover,
         logistics=logistics,
-        reliability=reliability,
+        reliability=tuple(reliability.items()),
         costs=costs,
         checksum=checksum
     )
@@ -238,181 +311,219 @@ def generate(uuid_text: str) -> ScenarioParams:
 # ----------------------------
 # LaTeX rendering
 # ----------------------------
+# One pass over the text; since each character is replaced only once, the
+# backslashes introduced by the other escapes are never escaped again
+_TEX_TABLE = str.maketrans({
+    "\\": "\\textbackslash{}",
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+})
+
 def tex_escape(s: str) -> str:
-    return (s.replace("&", "\\&")
-             .replace("%", "\\%")
-             .replace("$", "\\$")
-             .replace("#", "\\#")
-             .replace("_", "\\_")
-             .replace("{", "\\{")
-             .replace("}", "\\}")
-             .replace("~", "\\textasciitilde{}")
-             .replace("^", "\\textasciicircum{}")
-             .replace("\\", "\\textbackslash{}"))
+    return s.translate(_TEX_TABLE)
+
+# Static text of the document, joined once at import and returned as is:
+# the preamble, the narrative sections before the parameter tables, and
+# everything after them
+_PREAMBLE = "\n".join((
+    r"\documentclass[11pt,a4paper]{article}",
+    r"\usepackage[margin=2.5cm,landscape]{geometry}",
+    r"\usepackage{booktabs}",
+    r"\usepackage{siunitx}",
+    r"\usepackage{enumitem}",
+    # Everything above is shared by all scenarios and can be dumped into a
+    # pdflatex format (mylatexformat); \relax when compiled normally
+    r"\csname endofdump\endcsname",
+    r"\usepackage[hidelinks]{hyperref}",
+    r"\usepackage{caption}",
+    r"\usepackage{longtable}",
+    r"\sisetup{detect-all=true}",
+    "",
+    r"\setlist[itemize]{nosep}",
+    r"\setlist[enumerate]{nosep}",
+    "",
+    r"\title{MENGM0056 - Product and Production Systems\\Scenario 3: FMCG - Bottled Beverage (500 ml)}",
+    r"\author{Hand-out for Group Coursework (2025/26)}",
+    r"\date{}",
+    r"\begin{document}",
+    r"\maketitle",
+    "",
+)) + "\n"
+
+_INTRO = "\n".join((
+    "",
+    r"\section*{Purpose}",
+    r"This scenario considers a high-throughput beverage line with volatile demand and despatch congestion. Your task is to propose operational policies that stabilise service level and improve utilisation while controlling changeover losses and inventory.",
+    "",
+    r"\section*{Narrative}",
+    r"A 500~ml carbonated soft drink is produced in PET bottles. The line comprises blow-moulding, filling, labelling, case-packing and palletising, with despatch to outbound trucks via limited loading bays. Demand varies with weather and promotions. CIP and changeovers consume valuable capacity. Capital spend is constrained; improvements should focus on scheduling, policies, and parameter changes.",
+    "",
+    r"\section*{Entities and flow (fixed structure)}",
+    r"Preforms $\rightarrow$ Blow-mould $\rightarrow$ Fill $\rightarrow$ Cap $\rightarrow$ Label $\rightarrow$ Case-pack $\rightarrow$ Palletise $\rightarrow$ Despatch.",
+    "",
+    r"\section*{Baseline parameters (seeded)}",
+)) + "\n"
+
+_POSTAMBLE = "\n".join((
+    # Required KPIs
+    r"\section*{Required KPIs}",
+    r"\begin{itemize}",
+    r"\item Line utilisation by unit (blow-moulder, filler, labeller, packer, palletiser).",
+    r"\item Changeover time and product loss per week; percentage of capacity lost to changeovers/CIP.",
+    r"\item Order lead time distribution and on-time despatch rate (service level).",
+    r"\item Loading-bay utilisation and maximum truck queue length; truck lateness count.",
+    r"\item Finished-goods days-of-cover and average pallets in buffer.",
+    r"\end{itemize}",
+    # Techniques
+    r"\section*{Techniques to apply}",
+    r"\begin{itemize}",
+    r"\item \textbf{Modelling \& KPIs}: capacity model, bottleneck identification, changeover loss accounting.",
+    r"\item \textbf{Mathematical programming}: shift patterns, SKU sequencing and batch sizing subject to CIP and bay constraints.",
+    r"\item \textbf{Uncertainty modelling}: daily demand and truck arrivals; downtime distributions.",
+    r"\item \textbf{Simulation}: discrete-event model of the line and despatch yard; evaluate congestion and schedules.",
+    r"\item \textbf{Metaheuristic optimisation}: lot-sizing and sequence optimisation with changeover penalties and service-level targets.",
+    r"\end{itemize}",
+    # Improvement levers
+    r"\section*{Improvement levers (examples)}",
+    r"\begin{itemize}",
+    r"\item SKU sequencing to group labels and reduce full CIP events; threshold policies for label-only changes.",
+    r"\item Time-of-day despatch smoothing: reserve windows for large orders; dynamic bay assignment.",
+    r"\item Buffer targets before palletiser and before despatch to prevent starvation/blocking.",
+    r"\item Preventive maintenance windows aligned with expected demand troughs.",
+    r"\end{itemize}",
+    # Deliverables
+    r"\section*{Deliverables}",
+    r"\begin{enumerate}",
+    r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).",
+    r"\item The report should contain a production and despatch plan for one representative week, showing SKU sequence, batch sizes, and expected service level.",
+    r"\item Model files (e.g., simulation, optimisation) as appendices/evidence.",
+    r"\end{enumerate}",
+    # Assessment
+    r"\section*{Assessment emphasis}",
+    r"Clarity and correctness of the capacity and KPI model; appropriate choice and justification of techniques; quality of experimental design; robustness to demand variability; and persuasiveness of recommendations under operational constraints.",
+    # Reproducibility
+    r"\section*{Data ethics and reproducibility}",
+    r"Report your UUID seed and any random seeds used within tools. Provide enough detail for independent regeneration of your parameter tables.",
+    "",
+    r"\end{document}",
+))
 
-def render_latex(p: ScenarioParams) -> str:
-    g = p.global_params
-    ch = p.changeover
-    lg = p.logistics
-
-    lines = []
-    lines.append(r"\documentclass[11pt,a4paper]{article}")
-    lines.append(r"\usepackage[margin=2.5cm,landscape]{geometry}")
-    lines.append(r"\usepackage{booktabs}")
-    lines.append(r"\usepackage{siunitx}")
-    lines.append(r"\usepackage{enumitem}")
-    lines.append(r"\usepackage[hidelinks]{hyperref}")
-    lines.append(r"\usepackage{caption}")
-    lines.append(r"\usepackage{longtable}")
-    lines.append(r"\sisetup{detect-all=true}")
-    lines.append("")
-    lines.append(r"\setlist[itemize]{nosep}")
-    lines.append(r"\setlist[enumerate]{nosep}")
-    lines.append("")
-    lines.append(r"\title{MENGM0056 - Product and Production Systems\\Scenario 3: FMCG - Bottled Beverage (500 ml)}")
-    lines.append(r"\author{Hand-out for Group Coursework (2025/26)}")
-    lines.append(r"\date{}")
-    lines.append(r"\begin{document}")
-    lines.append(r"\maketitle")
-    lines.append("")
-    lines.append(r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum)
-    lines.append("")
-    lines.append(r"\section*{Purpose}")
-    lines.append(r"This scenario considers a high-throughput beverage line with volatile demand and despatch congestion. Your task is to propose operational policies that stabilise service level and improve utilisation while controlling changeover losses and inventory.")
-    lines.append("")
-    lines.append(r"\section*{Narrative}")
-    lines.append(r"A 500~ml carbonated soft drink is produced in PET bottles. The line comprises blow-moulding, filling, labelling, case-packing and palletising, with despatch to outbound trucks via limited loading bays. Demand varies with weather and promotions. CIP and changeovers consume valuable capacity. Capital spend is constrained; improvements should focus on scheduling, policies, and parameter changes.")
-    lines.append("")
-    lines.append(r"\section*{Entities and flow (fixed structure)}")
-    lines.append(r"Preforms $\rightarrow$ Blow-mould $\rightarrow$ Fill $\rightarrow$ Cap $\rightarrow$ Label $\rightarrow$ Case-pack $\rightarrow$ Palletise $\rightarrow$ Despatch.")
-    lines.append("")
-    lines.append(r"\section*{Baseline parameters (seeded)}")
+_UUID_LINE = r"\noindent \textbf{{UUID seed:}} {uuid_esc} \quad \textbf{{Checksum:}} {p.checksum}" + "\n"
 
+# The parameter tables as one str.format template (LaTeX braces doubled); only
+# the seeded values and the few derived strings below are substituted per call
+_TABLES = "\n".join((
     # Global
-    lines.append(r"\subsection*{Global}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Shifts per day & {g.shifts_per_day} \\")
-    lines.append(rf"Shift length & {g.shift_length_hours}~h \\")
-    lines.append(rf"Base daily demand & {g.base_daily_demand_cases}~cases/day (12 bottles/case) \\")
-    lines.append(rf"Daily demand CV & {g.demand_cv_daily} \\")
-    lines.append(rf"Number of SKUs & {g.sku_count} \\")
-    lines.append(rf"On-time despatch target & {int(g.service_level_target*100)}\% \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Global}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Shifts per day & {g.shifts_per_day} \\",
+    r"Shift length & {g.shift_length_hours}~h \\",
+    r"Base daily demand & {g.base_daily_demand_cases}~cases/day (12 bottles/case) \\",
+    r"Daily demand CV & {g.demand_cv_daily} \\",
+    r"Number of SKUs & {g.sku_count} \\",
+    r"On-time despatch target & {service_pct}\% \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Line capacities
-    lines.append(r"\subsection*{Line capacities and availability}")
-    lines.append(r"\begin{tabular}{@{}llll@{}}")
-    lines.append(r"\toprule")
-    lines.append(r"\textbf{Resource} & \textbf{Count} & \textbf{Nominal rate} & \textbf{Availability} \\")
-    lines.append(r"\midrule")
-    lines.append(rf"Blow-moulder & {p.blow_moulder.count} & {p.blow_moulder.rate_bph}~bph & {p.blow_moulder.availability} \\")
-    lines.append(rf"Filler & {p.filler.count} & {p.filler.rate_bph}~bph & {p.filler.availability} \\")
-    lines.append(rf"Labeller & {p.labeller.count} & {p.labeller.rate_bph}~bph & {p.labeller.availability} \\")
-    lines.append(rf"Case-packer & {p.packer.count} & {p.packer.case_rate_cph}~cph & {p.packer.availability} \\")
-    lines.append(rf"Palletiser & {p.palletiser.count} & {p.palletiser.case_rate_cph}~cph & {p.palletiser.availability} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Line capacities and availability}}",
+    r"\begin{{tabular}}{{@{{}}llll@{{}}}}",
+    r"\toprule",
+    r"\textbf{{Resource}} & \textbf{{Count}} & \textbf{{Nominal rate}} & \textbf{{Availability}} \\",
+    r"\midrule",
+    r"Blow-moulder & {p.blow_moulder.count} & {p.blow_moulder.rate_bph}~bph & {p.blow_moulder.availability} \\",
+    r"Filler & {p.filler.count} & {p.filler.rate_bph}~bph & {p.filler.availability} \\",
+    r"Labeller & {p.labeller.count} & {p.labeller.rate_bph}~bph & {p.labeller.availability} \\",
+    r"Case-packer & {p.packer.count} & {p.packer.case_rate_cph}~cph & {p.packer.availability} \\",
+    r"Palletiser & {p.palletiser.count} & {p.palletiser.case_rate_cph}~cph & {p.palletiser.availability} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Changeovers
-    lines.append(r"\subsection*{Changeovers and CIP}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"CIP duration (flavour) & {ch.cip_min}~min \\")
-    lines.append(rf"Additional flavour change operations & {ch.flavour_change_min}~min \\")
-    lines.append(rf"Label-only change duration & {ch.label_change_min}~min \\")
-    lines.append(rf"Minimum batch size & {ch.min_batch_cases}~cases \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Changeovers and CIP}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"CIP duration (flavour) & {ch.cip_min}~min \\",
+    r"Additional flavour change operations & {ch.flavour_change_min}~min \\",
+    r"Label-only change duration & {ch.label_change_min}~min \\",
+    r"Minimum batch size & {ch.min_batch_cases}~cases \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Logistics
-    lines.append(r"\subsection*{Despatch and yard logistics}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Loading bays & {lg.loading_bays} \\")
-    lines.append(rf"Despatch window & {lg.despatch_start_hour}:00\,--\,{lg.despatch_end_hour}:00 \\")
-    lines.append(rf"Mean truck inter-arrival & {lg.truck_interarrival_mean_min}~min \\")
-    lines.append(rf"Truck service time & {lg.truck_service_min}~min \\")
-    lines.append(rf"Cases per pallet & {lg.cases_per_pallet} \\")
-    lines.append(rf"Pallets per truck & {lg.pallets_per_truck} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Despatch and yard logistics}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Loading bays & {lg.loading_bays} \\",
+    r"Despatch window & {lg.despatch_start_hour}:00\,--\,{lg.despatch_end_hour}:00 \\",
+    r"Mean truck inter-arrival & {lg.truck_interarrival_mean_min}~min \\",
+    r"Truck service time & {lg.truck_service_min}~min \\",
+    r"Cases per pallet & {lg.cases_per_pallet} \\",
+    r"Pallets per truck & {lg.pallets_per_truck} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Reliability
-    lines.append(r"\subsection*{Reliability (downtime parameters)}")
-    lines.append(r"\begin{tabular}{@{}lll@{}}")
-    lines.append(r"\toprule Resource & MTBF (min) & MTTR (min) \\")
-    lines.append(r"\midrule")
-    for k, v in p.reliability.items():
-        lines.append(rf"{k} & {v.mtbf_min} & {v.mttr_min} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Reliability (downtime parameters)}}",
+    r"\begin{{tabular}}{{@{{}}lll@{{}}}}",
+    r"\toprule Resource & MTBF (min) & MTTR (min) \\",
+    r"\midrule",
+    # generate() always builds these five resources, in this order
+    r"BlowMoulder & {r[BlowMoulder].mtbf_min} & {r[BlowMoulder].mttr_min} \\",
+    r"Filler & {r[Filler].mtbf_min} & {r[Filler].mttr_min} \\",
+    r"Labeller & {r[Labeller].mtbf_min} & {r[Labeller].mttr_min} \\",
+    r"Packer & {r[Packer].mtbf_min} & {r[Packer].mttr_min} \\",
+    r"Palletiser & {r[Palletiser].mtbf_min} & {r[Palletiser].mttr_min} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Costs
-    lines.append(r"\subsection*{Costs}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Holding cost & \pounds {p.costs.holding_cost_per_pallet_day}~/pallet/day \\")
-    lines.append(rf"Changeover cost (all-in) & \pounds {p.costs.changeover_cost_per_event}~/event \\")
-    lines.append(rf"Lateness penalty & \pounds {p.costs.lateness_penalty_per_truck}~/late~truck \\")
-    lines.append(rf"Scrap cost (changeover/CIP) & \pounds {p.costs.scrap_cost_per_case}~/case \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
-    # Required KPIs
-    lines.append(r"\section*{Required KPIs}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Line utilisation by unit (blow-moulder, filler, labeller, packer, palletiser).")
-    lines.append(r"\item Changeover time and product loss per week; percentage of capacity lost to changeovers/CIP.")
-    lines.append(r"\item Order lead time distribution and on-time despatch rate (service level).")
-    lines.append(r"\item Loading-bay utilisation and maximum truck queue length; truck lateness count.")
-    lines.append(r"\item Finished-goods days-of-cover and average pallets in buffer.")
-    lines.append(r"\end{itemize}")
-
-    # Techniques
-    lines.append(r"\section*{Techniques to apply}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item \textbf{Modelling \& KPIs}: capacity model, bottleneck identification, changeover loss accounting.")
-    lines.append(r"\item \textbf{Mathematical programming}: shift patterns, SKU sequencing and batch sizing subject to CIP and bay constraints.")
-    lines.append(r"\item \textbf{Uncertainty modelling}: daily demand and truck arrivals; downtime distributions.")
-    lines.append(r"\item \textbf{Simulation}: discrete-event model of the line and despatch yard; evaluate congestion and schedules.")
-    lines.append(r"\item \textbf{Metaheuristic optimisation}: lot-sizing and sequence optimisation with changeover penalties and service-level targets.")
-    lines.append(r"\end{itemize}")
-
-    # Improvement levers
-    lines.append(r"\section*{Improvement levers (examples)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item SKU sequencing to group labels and reduce full CIP events; threshold policies for label-only changes.")
-    lines.append(r"\item Time-of-day despatch smoothing: reserve windows for large orders; dynamic bay assignment.")
-    lines.append(r"\item Buffer targets before palletiser and before despatch to prevent starvation/blocking.")
-    lines.append(r"\item Preventive maintenance windows aligned with expected demand troughs.")
-    lines.append(r"\end{itemize}")
-
-    # Deliverables
-    lines.append(r"\section*{Deliverables}")
-    lines.append(r"\begin{enumerate}")
-    lines.append(r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).")
-    lines.append(r"\item The report should contain a production and despatch plan for one representative week, showing SKU sequence, batch sizes, and expected service level.")
-    lines.append(r"\item Model files (e.g., simulation, optimisation) as appendices/evidence.")
-    lines.append(r"\end{enumerate}")
-
-    # Assessment
-    lines.append(r"\section*{Assessment emphasis}")
-    lines.append(r"Clarity and correctness of the capacity and KPI model; appropriate choice and justification of techniques; quality of experimental design; robustness to demand variability; and persuasiveness of recommendations under operational constraints.")
+    r"\subsection*{{Costs}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Holding cost & \pounds {p.costs.holding_cost_per_pallet_day}~/pallet/day \\",
+    r"Changeover cost (all-in) & \pounds {p.costs.changeover_cost_per_event}~/event \\",
+    r"Lateness penalty & \pounds {p.costs.lateness_penalty_per_truck}~/late~truck \\",
+    r"Scrap cost (changeover/CIP) & \pounds {p.costs.scrap_cost_per_case}~/case \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+)) + "\n"
+
+def _template_values(p: ScenarioParams) -> dict:
+    g = p.global_params
+    return dict(
+        p=p, g=g, ch=p.changeover, lg=p.logistics, r=p.reliability_map,
+        uuid_esc=tex_escape(p.uuid),
+        service_pct=int(g.service_level_target*100),
+    )
 
-    # Reproducibility
-    lines.append(r"\section*{Data ethics and reproducibility}")
-    lines.append(r"Report your UUID seed and any random seeds used within tools. Provide enough detail for independent regeneration of your parameter tables.")
-    lines.append("")
-    lines.append(r"\end{document}")
-    return "\n".join(lines)
+def render_latex(p: ScenarioParams) -> str:
+    values = _template_values(p)
+    return "".join((_PREAMBLE, _UUID_LINE.format_map(values), _INTRO, _TABLES.format_map(values), _POSTAMBLE))
+
+# The static blocks as written by write_latex(), encoded once at import
+_PREAMBLE_UTF8 = _PREAMBLE.encode("utf-8")
+_INTRO_UTF8 = _INTRO.encode("utf-8")
+_POSTAMBLE_UTF8 = (_POSTAMBLE + "\n").encode("utf-8")
+
+def write_latex(p: ScenarioParams, out) -> None:
+    # Writes the document and a final newline as UTF-8 to a binary stream such
+    # as sys.stdout.buffer, piece by piece rather than as one joined string
+    values = _template_values(p)
+    out.write(_PREAMBLE_UTF8)
+    out.write(_UUID_LINE.format_map(values).encode("utf-8"))
+    out.write(_INTRO_UTF8)
+    out.write(_TABLES.format_map(values).encode("utf-8"))
+    out.write(_POSTAMBLE_UTF8)
 
 # ----------------------------
 # Main
@@ -422,9 +533,13 @@ def main():
     ap.add_argument("--uuid", required=True, help="UUID string (any version).")
     args = ap.parse_args()
 
-    params = generate(args.uuid)
-    tex = render_latex(params)
-    print(tex)
+    write_latex(generate(args.uuid), sys.stdout.buffer)
+    sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
+    # tex_escape must not re-escape the backslashes it inserts itself
+    assert tex_escape("a&b\\c") == r"a\&b\textbackslash{}c"
+    # Params must stay plain data: asdict() for JSON and pickle for worker processes
+    _p = generate("00000000-0000-0000-0000-000000000000")
+    assert pickle.loads(pickle.dumps(_p)) == _p and asdict(_p)["reliability"][0][0] == "BlowMoulder"
     main()
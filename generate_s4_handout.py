@@ -7,19 +7,24 @@ The same UUID always yields the same parameters.
 
 Usage:
   python generate_s4_handout.py --uuid <uuid-string> > mengm0056_s4_handout.tex
+  python generate_s4_handout.py --uuid <uuid-string> --cache-dir [dir] > mengm0056_s4_handout.tex
 """
 
 import argparse
 import hashlib
 import json
+import os
 import random
-from dataclasses import dataclass, asdict
+import re
+import sys
+import tempfile
+from dataclasses import dataclass
 from typing import Dict, Optional
 
 # ----------------------------
 # Data models
 # ----------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GlobalParams:
     shifts_per_day: int
     shift_length_hours: float
@@ -27,7 +32,7 @@ class GlobalParams:
     demand_spike_pct: int           # surge percentage for public health campaign
     on_time_target: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StationParams:
     count: int
     cycle_time_s: Optional[float] = None    # per-unit time (s); None for batch-only stages
@@ -41,17 +46,17 @@ class StationParams:
     batch_size_units: Optional[int] = None
     batch_time_min: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BufferPolicy:
     pre_eo_max_hours: float
     post_eo_quarantine_hours: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReliabilityParams:
     mtbf_min: float
     mttr_min: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostsParams:
     scrap_cost_per_unit: float
     pack_material_cost_per_unit: float
@@ -60,7 +65,7 @@ class CostsParams:
     rework_labour_cost_per_hour: float
     quality_escapes_cost_per_million: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioParams:
     uuid: str
     global_params: GlobalParams
@@ -77,9 +82,12 @@ class ScenarioParams:
 # ----------------------------
 # Deterministic RNG utilities
 # ----------------------------
+# The seed is part of the handout contract: every UUID already issued maps to
+# its parameters and checksum through the first 32 bits of SHA-256, so the
+# hash (and the Mersenne Twister it seeds) must not change.
 def make_rng(seed_text: str) -> random.Random:
-    digest = hashlib.sha256(seed_text.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)  # stable 32-bit seed
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    seed = int.from_bytes(digest[:4], "big")  # stable 32-bit seed (first 8 hex digits)
     return random.Random(seed)
 
 def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2) -> float:
@@ -94,6 +102,35 @@ def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 4) ->
     x = max(0.0, min(1.0, x))
     return round(x, decimals)
 
+# ----------------------------
+# Checksum serialisation
+# ----------------------------
+# Hand-written equivalents of json.dumps(asdict(obj), sort_keys=True), one per
+# data model: the keys are literals in sorted order and the values are read as
+# plain attributes. Every field of a model must appear here, so adding a field
+# to a dataclass means adding it to its serialiser too.
+def _global_json(g: GlobalParams) -> str:
+    return '{"demand_nominal_per_day": %r, "demand_spike_pct": %r, "on_time_target": %r, "shift_length_hours": %r, "shifts_per_day": %r}' % (
+        g.demand_nominal_per_day, g.demand_spike_pct, g.on_time_target, g.shift_length_hours, g.shifts_per_day)
+
+def _station_json(s: StationParams) -> str:
+    # Unset Optional fields are null, as json.dumps writes None
+    return '{"batch_size_units": %s, "batch_time_min": %s, "count": %s, "cycle_time_s": %s, "detect_prob": %s, "false_fail": %s, "fpy": %s, "rework_success": %s, "rework_time_s": %s, "scrap_rate": %s}' % tuple(
+        "null" if v is None else repr(v) for v in (
+            s.batch_size_units, s.batch_time_min, s.count, s.cycle_time_s, s.detect_prob,
+            s.false_fail, s.fpy, s.rework_success, s.rework_time_s, s.scrap_rate))
+
+def _policy_json(b: BufferPolicy) -> str:
+    return '{"post_eo_quarantine_hours": %r, "pre_eo_max_hours": %r}' % (b.post_eo_quarantine_hours, b.pre_eo_max_hours)
+
+def _reliability_json(r: ReliabilityParams) -> str:
+    return '{"mtbf_min": %r, "mttr_min": %r}' % (r.mtbf_min, r.mttr_min)
+
+def _costs_json(c: CostsParams) -> str:
+    return '{"labour_cost_per_hour": %r, "pack_material_cost_per_unit": %r, "quality_escapes_cost_per_million": %r, "rework_labour_cost_per_hour": %r, "scrap_cost_per_unit": %r, "sterilisation_cost_per_batch": %r}' % (
+        c.labour_cost_per_hour, c.pack_material_cost_per_unit, c.quality_escapes_cost_per_million,
+        c.rework_labour_cost_per_hour, c.scrap_cost_per_unit, c.sterilisation_cost_per_batch)
+
 # ----------------------------
 # Parameter generation
 # ----------------------------
@@ -189,21 +226,21 @@ def generate(uuid_text: str) -> ScenarioParams:
         quality_escapes_cost_per_million=seeded_uniform(rng, 4000.0, 12000.0, 0)
     )
 
-    # Checksum for verification
-    tmp = {
-        "uuid": uuid_text,
-        "global_params": asdict(g),
-        "moulding": asdict(moulding),
-        "assembly": asdict(assembly),
-        "visual_inspection": asdict(visual),
-        "eo": asdict(eo),
-        "packing": asdict(pack),
-        "buffer_policy": asdict(policy),
-        "reliability": {k: asdict(v) for k, v in reliability.items()},
-        "costs": asdict(costs),
-    }
-    blob = json.dumps(tmp, sort_keys=True).encode("utf-8")
-    checksum = hashlib.sha256(blob).hexdigest()[:12]
+    # Checksum for verification. The text is exactly json.dumps(..., sort_keys=True)
+    # of the params, written out directly with the top-level keys in sorted order.
+    blob = "".join((
+        '{"assembly": ', _station_json(assembly),
+        ', "buffer_policy": ', _policy_json(policy),
+        ', "costs": ', _costs_json(costs),
+        ', "eo": ', _station_json(eo),
+        ', "global_params": ', _global_json(g),
+        ', "moulding": ', _station_json(moulding),
+        ', "packing": ', _station_json(pack),
+        ', "reliability": {', ", ".join(f'"{k}": {_reliability_json(reliability[k])}' for k in sorted(reliability)),
+        '}, "uuid": ', json.dumps(uuid_text),
+        ', "visual_inspection": ', _station_json(visual), '}',
+    )).encode("utf-8")
+    checksum = hashlib.sha256(blob).digest()[:6].hex()  # == hexdigest()[:12]
 
     return ScenarioParams(
         uuid=uuid_text,
@@ -222,166 +259,257 @@ def generate(uuid_text: str) -> ScenarioParams:
 # ----------------------------
 # LaTeX rendering
 # ----------------------------
+# One pass over the text; since each character is replaced only once, the
+# backslashes introduced by the other escapes are never escaped again
+_TEX_TABLE = str.maketrans({
+    "\\": "\\textbackslash{}",
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+})
+
+_TEX_SPECIALS_RE = re.compile(r"[\\&%$#_{}~^]")
+
 def tex_escape(s: str) -> str:
-    return (s.replace("&", "\\&")
-             .replace("%", "\\%")
-             .replace("$", "\\$")
-             .replace("#", "\\#")
-             .replace("_", "\\_")
-             .replace("{", "\\{")
-             .replace("}", "\\}")
-             .replace("~", "\\textasciitilde{}")
-             .replace("^", "\\textasciicircum{}")
-             .replace("\\", "\\textbackslash{}"))
+    # Canonical UUIDs contain none of the specials, and a regex search says so
+    # faster than translate() can walk the string doing per-character lookups
+    if _TEX_SPECIALS_RE.search(s) is None:
+        return s
+    return s.translate(_TEX_TABLE)
 
-def render_latex(p: ScenarioParams) -> str:
-    g = p.global_params
-    lines = []
-    lines.append(r"\documentclass[11pt,a4paper]{article}")
-    lines.append(r"\usepackage[margin=2.5cm,landscape]{geometry}")
-    lines.append(r"\usepackage{booktabs}")
-    lines.append(r"\usepackage{siunitx}")
-    lines.append(r"\usepackage{enumitem}")
-    lines.append(r"\usepackage[hidelinks]{hyperref}")
-    lines.append(r"\usepackage{caption}")
-    lines.append(r"\usepackage{longtable}")
-    lines.append(r"\sisetup{detect-all=true}")
-    lines.append("")
-    lines.append(r"\setlist[itemize]{nosep}")
-    lines.append(r"\setlist[enumerate]{nosep}")
-    lines.append("")
-    lines.append(r"\title{MENGM0056 - Product and Production Systems\\Scenario 4: Medical Devices - Disposable Syringes}")
-    lines.append(r"\author{Hand-out for Group Coursework (2025/26)}")
-    lines.append(r"\date{}")
-    lines.append(r"\begin{document}")
-    lines.append(r"\maketitle")
-    lines.append("")
-    lines.append(r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum)
-    lines.append("")
-    lines.append(r"\section*{Purpose}")
-    lines.append(r"This scenario addresses a regulated, high-volume medical-device operation. Your group receives seeded parameters for a syringe line and must deliver an improvement plan that achieves surge demand while maintaining compliance and quality, with limited scope for capital expenditure.")
-    lines.append("")
-    lines.append(r"\section*{Narrative}")
-    lines.append(r"A public health campaign has created a time-bound surge in orders for sterile syringes. The EO sterilisation chamber and downstream quarantine are known bottlenecks. Management prefers process and policy changes over new equipment in the short term. Regulatory compliance must be preserved.")
-    lines.append("")
-    lines.append(r"\section*{Entities and flow (fixed structure)}")
-    lines.append(r"Injection moulding (barrel, plunger) $\rightarrow$ Automated assembly with needle shield $\rightarrow$ 100\% visual inspection $\rightarrow$ EO sterilisation (batch) $\rightarrow$ Quarantine (post-EO) $\rightarrow$ Clean-room packing $\rightarrow$ Release testing.")
-    lines.append("")
-    lines.append(r"\section*{Baseline parameters (seeded)}")
-    # Global
-    lines.append(r"\subsection*{Global}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Shifts per day & {g.shifts_per_day} \\")
-    lines.append(rf"Shift length & {g.shift_length_hours}~h \\")
-    lines.append(rf"Demand (nominal) & {g.demand_nominal_per_day}~units/day \\")
-    lines.append(rf"Surge magnitude & {g.demand_spike_pct}\% above nominal \\")
-    lines.append(rf"On-time target & {int(g.on_time_target*100)}\% \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Stations table
-    lines.append(r"\subsection*{Stations and process timings}")
-    lines.append(r"\begin{tabular}{@{}lllll@{}}")
-    lines.append(r"\toprule")
-    lines.append(r"\textbf{Stage} & \textbf{Count} & \textbf{Time} & \textbf{Quality} & \textbf{Notes} \\")
-    lines.append(r"\midrule")
-    lines.append(rf"Injection moulding & {p.moulding.count} & {p.moulding.cycle_time_s}~s/part & FPY {p.moulding.fpy} \newline (scrap {p.moulding.scrap_rate}) & Multi-cavity average \\")
-    lines.append(rf"Automated assembly & {p.assembly.count} & {p.assembly.cycle_time_s}~s/part & FPY {p.assembly.fpy} & Rework {p.assembly.rework_time_s}~s (success {p.assembly.rework_success}) \\")
-    lines.append(rf"Visual inspection & {p.visual_inspection.count} & {p.visual_inspection.cycle_time_s}~s/part & Detect {p.visual_inspection.detect_prob} (false fail {p.visual_inspection.false_fail}) & 100\% coverage \\")
-    if p.eo.batch_size_units and p.eo.batch_time_min:
-        lines.append(rf"EO sterilisation (batch) & {p.eo.count} & {p.eo.batch_time_min}~min/batch & - & Batch size {p.eo.batch_size_units} units \\")
-    lines.append(rf"Clean-room packing & {p.packing.count} & - & FPY {p.packing.fpy} & Operators; per-operator rate see policy \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Policy
-    lines.append(r"\subsection*{Buffer policy and quarantine}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Max pre-EO buffer & {p.buffer_policy.pre_eo_max_hours}~h \\")
-    lines.append(rf"Post-EO quarantine & {p.buffer_policy.post_eo_quarantine_hours}~h \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Reliability
-    lines.append(r"\subsection*{Reliability}")
-    lines.append(r"\begin{tabular}{@{}lll@{}}")
-    lines.append(r"\toprule Resource & MTBF (min) & MTTR (min) \\")
-    lines.append(r"\midrule")
-    for k, v in p.reliability.items():
-        lines.append(rf"{k} & {v.mtbf_min} & {v.mttr_min} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    # Costs
-    lines.append(r"\subsection*{Costs}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Scrap cost & \pounds {p.costs.scrap_cost_per_unit}~/unit \\")
-    lines.append(rf"Pack material cost & \pounds {p.costs.pack_material_cost_per_unit}~/unit \\")
-    lines.append(rf"EO sterilisation cost & \pounds {p.costs.sterilisation_cost_per_batch}~/batch \\")
-    lines.append(rf"Labour cost & \pounds {p.costs.labour_cost_per_hour}~/h \\")
-    lines.append(rf"Rework labour cost & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\")
-    lines.append(rf"Quality escapes proxy & \pounds {int(p.costs.quality_escapes_cost_per_million)}~/million units \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
+# Static text of the document, joined once at import and returned as is:
+# the preamble, the narrative sections before the parameter tables, and
+# everything after them
+_PREAMBLE = "\n".join((
+    r"\documentclass[11pt,a4paper]{article}",
+    r"\usepackage[margin=2.5cm,landscape]{geometry}",
+    r"\usepackage{booktabs}",
+    r"\usepackage{siunitx}",
+    r"\usepackage{enumitem}",
+    # Everything above is shared by all scenarios and can be dumped into a
+    # pdflatex format (mylatexformat); \relax when compiled normally
+    r"\csname endofdump\endcsname",
+    r"\usepackage[hidelinks]{hyperref}",
+    r"\usepackage{caption}",
+    r"\usepackage{longtable}",
+    r"\sisetup{detect-all=true}",
+    "",
+    r"\setlist[itemize]{nosep}",
+    r"\setlist[enumerate]{nosep}",
+    "",
+    r"\title{MENGM0056 - Product and Production Systems\\Scenario 4: Medical Devices - Disposable Syringes}",
+    r"\author{Hand-out for Group Coursework (2025/26)}",
+    r"\date{}",
+    r"\begin{document}",
+    r"\maketitle",
+    "",
+)) + "\n"
+
+_INTRO = "\n".join((
+    "",
+    r"\section*{Purpose}",
+    r"This scenario addresses a regulated, high-volume medical-device operation. Your group receives seeded parameters for a syringe line and must deliver an improvement plan that achieves surge demand while maintaining compliance and quality, with limited scope for capital expenditure.",
+    "",
+    r"\section*{Narrative}",
+    r"A public health campaign has created a time-bound surge in orders for sterile syringes. The EO sterilisation chamber and downstream quarantine are known bottlenecks. Management prefers process and policy changes over new equipment in the short term. Regulatory compliance must be preserved.",
+    "",
+    r"\section*{Entities and flow (fixed structure)}",
+    r"Injection moulding (barrel, plunger) $\rightarrow$ Automated assembly with needle shield $\rightarrow$ 100\% visual inspection $\rightarrow$ EO sterilisation (batch) $\rightarrow$ Quarantine (post-EO) $\rightarrow$ Clean-room packing $\rightarrow$ Release testing.",
+    "",
+    r"\section*{Baseline parameters (seeded)}",
+)) + "\n"
+
+_POSTAMBLE = "\n".join((
     # KPIs
-    lines.append(r"\section*{Required KPIs}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item End-to-end lead time and on-time delivery probability under surge conditions.")
-    lines.append(r"\item EO chamber utilisation, number of batches/day, and queue time into EO.")
-    lines.append(r"\item Quarantine inventory and release rate; packing throughput and operator utilisation.")
-    lines.append(r"\item FPY by stage and rolled throughput yield (RTY); rework rate and rework hours/day.")
-    lines.append(r"\item Scrap cost per unit and expected cost of quality escapes.")
-    lines.append(r"\end{itemize}")
+    r"\section*{Required KPIs}",
+    r"\begin{itemize}",
+    r"\item End-to-end lead time and on-time delivery probability under surge conditions.",
+    r"\item EO chamber utilisation, number of batches/day, and queue time into EO.",
+    r"\item Quarantine inventory and release rate; packing throughput and operator utilisation.",
+    r"\item FPY by stage and rolled throughput yield (RTY); rework rate and rework hours/day.",
+    r"\item Scrap cost per unit and expected cost of quality escapes.",
+    r"\end{itemize}",
     # Techniques
-    lines.append(r"\section*{Techniques to apply}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item \textbf{Modelling \& KPIs}: RTY ladder; EO batch sizing logic; capacity calculations.")
-    lines.append(r"\item \textbf{Mathematical programming}: EO batch sequencing; shift and packing-station staffing to achieve surge output.")
-    lines.append(r"\item \textbf{Uncertainty modelling}: Breakdown and false-fail distributions; demand surge profiles; contamination risk as rare events.")
-    lines.append(r"\item \textbf{Simulation}: Discrete-event simulation focused on EO bottleneck, quarantine, and packing; test push vs. pull policies.")
-    lines.append(r"\item \textbf{Metaheuristic optimisation}: Multi-objective tuning of batch sizes, start times, and buffer limits for on-time delivery vs. WIP.")
-    lines.append(r"\item \textbf{CAE (optional)}: If proposing design or fixture changes affecting assembly time or defect modes.")
-    lines.append(r"\end{itemize}")
+    r"\section*{Techniques to apply}",
+    r"\begin{itemize}",
+    r"\item \textbf{Modelling \& KPIs}: RTY ladder; EO batch sizing logic; capacity calculations.",
+    r"\item \textbf{Mathematical programming}: EO batch sequencing; shift and packing-station staffing to achieve surge output.",
+    r"\item \textbf{Uncertainty modelling}: Breakdown and false-fail distributions; demand surge profiles; contamination risk as rare events.",
+    r"\item \textbf{Simulation}: Discrete-event simulation focused on EO bottleneck, quarantine, and packing; test push vs. pull policies.",
+    r"\item \textbf{Metaheuristic optimisation}: Multi-objective tuning of batch sizes, start times, and buffer limits for on-time delivery vs. WIP.",
+    r"\item \textbf{CAE (optional)}: If proposing design or fixture changes affecting assembly time or defect modes.",
+    r"\end{itemize}",
     # Levers
-    lines.append(r"\section*{Improvement levers (examples, not exhaustive)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item EO campaign scheduling (stagger starts, night runs) within pre-defined safety windows.")
-    lines.append(r"\item Rework triage rules after visual inspection to minimise non-value-adding loops.")
-    lines.append(r"\item Temporary reallocation of operators to packing during surge hours; dynamic takt alignment.")
-    lines.append(r"\item Adjust max pre-EO buffer and quarantine durations where compliant, evaluating risk and service impact.")
-    lines.append(r"\end{itemize}")
+    r"\section*{Improvement levers (examples, not exhaustive)}",
+    r"\begin{itemize}",
+    r"\item EO campaign scheduling (stagger starts, night runs) within pre-defined safety windows.",
+    r"\item Rework triage rules after visual inspection to minimise non-value-adding loops.",
+    r"\item Temporary reallocation of operators to packing during surge hours; dynamic takt alignment.",
+    r"\item Adjust max pre-EO buffer and quarantine durations where compliant, evaluating risk and service impact.",
+    r"\end{itemize}",
     # Deliverables
-    lines.append(r"\section*{Deliverables}")
-    lines.append(r"\begin{enumerate}")
-    lines.append(r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).")
-    lines.append(r"\item The report should contain a surge-response plan demonstrating capacity to meet demand spike while maintaining compliance.")
-    lines.append(r"\item Model files (simulation, optimisation) as appendices or evidence.")
-    lines.append(r"\end{enumerate}")
+    r"\section*{Deliverables}",
+    r"\begin{enumerate}",
+    r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).",
+    r"\item The report should contain a surge-response plan demonstrating capacity to meet demand spike while maintaining compliance.",
+    r"\item Model files (simulation, optimisation) as appendices or evidence.",
+    r"\end{enumerate}",
     # Assessment
-    lines.append(r"\section*{Assessment emphasis}")
-    lines.append(r"Appropriate KPI selection; correctness and transparency of models; evidence-based policy choices; robustness under uncertainty; and clear recommendations that respect regulatory constraints.")
+    r"\section*{Assessment emphasis}",
+    r"Appropriate KPI selection; correctness and transparency of models; evidence-based policy choices; robustness under uncertainty; and clear recommendations that respect regulatory constraints.",
     # Reproducibility
-    lines.append(r"\section*{Data ethics and reproducibility}")
-    lines.append(r"Report your UUID seed and any random seeds used within tools. Provide sufficient detail for independent regeneration of your parameter tables.")
-    lines.append("")
-    lines.append(r"\end{document}")
-    return "\n".join(lines)
+    r"\section*{Data ethics and reproducibility}",
+    r"Report your UUID seed and any random seeds used within tools. Provide sufficient detail for independent regeneration of your parameter tables.",
+    "",
+    r"\end{document}",
+))
+
+_UUID_LINE = r"\noindent \textbf{{UUID seed:}} {uuid_esc} \quad \textbf{{Checksum:}} {p.checksum}" + "\n"
+
+# The parameter tables as one str.format template (LaTeX braces doubled); only
+# the seeded values and the few derived strings below are substituted per call
+_TABLES = "\n".join((
+    # Global
+    r"\subsection*{{Global}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Shifts per day & {g.shifts_per_day} \\",
+    r"Shift length & {g.shift_length_hours}~h \\",
+    r"Demand (nominal) & {g.demand_nominal_per_day}~units/day \\",
+    r"Surge magnitude & {g.demand_spike_pct}\% above nominal \\",
+    r"On-time target & {on_time_pct}\% \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Stations table
+    r"\subsection*{{Stations and process timings}}",
+    r"\begin{{tabular}}{{@{{}}lllll@{{}}}}",
+    r"\toprule",
+    r"\textbf{{Stage}} & \textbf{{Count}} & \textbf{{Time}} & \textbf{{Quality}} & \textbf{{Notes}} \\",
+    r"\midrule",
+    r"Injection moulding & {p.moulding.count} & {p.moulding.cycle_time_s}~s/part & FPY {p.moulding.fpy} \newline (scrap {p.moulding.scrap_rate}) & Multi-cavity average \\",
+    r"Automated assembly & {p.assembly.count} & {p.assembly.cycle_time_s}~s/part & FPY {p.assembly.fpy} & Rework {p.assembly.rework_time_s}~s (success {p.assembly.rework_success}) \\",
+    r"Visual inspection & {p.visual_inspection.count} & {p.visual_inspection.cycle_time_s}~s/part & Detect {p.visual_inspection.detect_prob} (false fail {p.visual_inspection.false_fail}) & 100\% coverage \\",
+    r"{eo_row}Clean-room packing & {p.packing.count} & - & FPY {p.packing.fpy} & Operators; per-operator rate see policy \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Policy
+    r"\subsection*{{Buffer policy and quarantine}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Max pre-EO buffer & {p.buffer_policy.pre_eo_max_hours}~h \\",
+    r"Post-EO quarantine & {p.buffer_policy.post_eo_quarantine_hours}~h \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Reliability
+    r"\subsection*{{Reliability}}",
+    r"\begin{{tabular}}{{@{{}}lll@{{}}}}",
+    r"\toprule Resource & MTBF (min) & MTTR (min) \\",
+    r"\midrule",
+    "{reliability_rows}",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    # Costs
+    r"\subsection*{{Costs}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Scrap cost & \pounds {p.costs.scrap_cost_per_unit}~/unit \\",
+    r"Pack material cost & \pounds {p.costs.pack_material_cost_per_unit}~/unit \\",
+    r"EO sterilisation cost & \pounds {p.costs.sterilisation_cost_per_batch}~/batch \\",
+    r"Labour cost & \pounds {p.costs.labour_cost_per_hour}~/h \\",
+    r"Rework labour cost & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\",
+    r"Quality escapes proxy & \pounds {escapes_cost}~/million units \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+)) + "\n"
+
+# Optional Stations row; carries its own newline so nothing is left when absent
+_EO_ROW = r"EO sterilisation (batch) & {p.eo.count} & {p.eo.batch_time_min}~min/batch & - & Batch size {p.eo.batch_size_units} units \\" + "\n"
+
+def _template_values(p: ScenarioParams) -> dict:
+    g = p.global_params
+    eo_row = _EO_ROW.format(p=p) if p.eo.batch_size_units and p.eo.batch_time_min else ""
+    return dict(
+        p=p, g=g,
+        uuid_esc=tex_escape(p.uuid),
+        on_time_pct=int(g.on_time_target*100),
+        eo_row=eo_row,
+        reliability_rows="\n".join(f"{k} & {v.mtbf_min} & {v.mttr_min} \\\\" for k, v in p.reliability.items()),
+        escapes_cost=int(p.costs.quality_escapes_cost_per_million),
+    )
+
+def render_latex(p: ScenarioParams) -> str:
+    values = _template_values(p)
+    return "".join((_PREAMBLE, _UUID_LINE.format_map(values), _INTRO, _TABLES.format_map(values), _POSTAMBLE))
+
+# The static blocks as written by write_latex(), encoded once at import
+_PREAMBLE_UTF8 = _PREAMBLE.encode("utf-8")
+_INTRO_UTF8 = _INTRO.encode("utf-8")
+_POSTAMBLE_UTF8 = (_POSTAMBLE + "\n").encode("utf-8")
+
+def write_latex(p: ScenarioParams, out) -> None:
+    # Writes the document and a final newline as UTF-8 to a binary stream such
+    # as sys.stdout.buffer, piece by piece rather than as one joined string
+    values = _template_values(p)
+    out.write(_PREAMBLE_UTF8)
+    out.write(_UUID_LINE.format_map(values).encode("utf-8"))
+    out.write(_INTRO_UTF8)
+    out.write(_TABLES.format_map(values).encode("utf-8"))
+    out.write(_POSTAMBLE_UTF8)
 
 # ----------------------------
 # Main
 # ----------------------------
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mengm0056", "s4")
+
+def cached_render(uuid_text: str, cache_dir: str) -> str:
+    # On-disk memo of render_latex(generate(uuid)), keyed on the UUID and this
+    # file's mtime so that editing the generator invalidates earlier entries
+    stamp = os.stat(__file__).st_mtime_ns
+    key = hashlib.sha256(f"{uuid_text.strip()}\0{stamp}".encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, key + ".tex")
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    tex = render_latex(generate(uuid_text))
+    # Write-then-rename, so concurrent runs never read a partial file
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(tex)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tex
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--uuid", required=True, help="UUID string (any version).")
+    ap.add_argument("--cache-dir", nargs="?", const=DEFAULT_CACHE_DIR, default=None,
+                    help=f"Reuse rendered hand-outs cached in this directory (default {DEFAULT_CACHE_DIR}).")
     args = ap.parse_args()
 
-    params = generate(args.uuid)
-    tex = render_latex(params)
-    print(tex)
+    out = sys.stdout.buffer
+    if args.cache_dir:
+        out.write(cached_render(args.uuid, args.cache_dir).encode("utf-8") + b"\n")
+    else:
+        write_latex(generate(args.uuid), out)
+    out.flush()
 
 if __name__ == "__main__":
     main()
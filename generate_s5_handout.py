@@ -7,19 +7,27 @@ The same UUID always yields the same parameters.
 
 Usage:
   python generate_s5_handout.py --uuid <uuid-string> > mengm0056_s5_handout.tex
+  python generate_s5_handout.py --uuid-file roster.txt --out-dir build
+    (one lower-case UUID per line; writes build/<uuid>/mengm0056_s5_handout.tex,
+     other lines are reported on stderr and skipped)
 """
 
 import argparse
+import functools
 import hashlib
 import json
+import pickle
 import random
-from dataclasses import dataclass, asdict
-from typing import Dict
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Tuple
+
+import handout_batch
 
 # ----------------------------
 # Data models
 # ----------------------------
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GlobalParams:
     shifts_per_day: int
     shift_length_hours: float
@@ -27,12 +35,12 @@ class GlobalParams:
     oee_target: float
     demand_cv: float  # coefficient of variation in daily demand
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StationParams:
     count: int
     cycle_time_s: float  # per unit or per batch as stated in notes
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QualityParams:
     weld_defect_rate: float          # module weld splash/defect rate
     rework_success: float            # success probability of weld rework
@@ -43,12 +51,12 @@ class QualityParams:
     cell_capacity_sigma_pc: float    # % sigma of cell capacity
     tim_thickness_sigma_mm: float    # mm sigma in thermal interface material
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReliabilityParams:
     mtbf_min: float
     mttr_min: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostsParams:
     scrap_cost_per_pack: float           # £/pack scrapped after assembly
     rework_labour_cost_per_hour: float   # £/h
@@ -56,7 +64,7 @@ class CostsParams:
     nitrogen_cost_per_hour: float        # £/h for welding shield gas
     tim_cost_per_pack: float             # £/pack
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioParams:
     uuid: str
     global_params: GlobalParams
@@ -68,17 +76,25 @@ class ScenarioParams:
     bms_flash: StationParams
     pack_eol: StationParams
     leak_test: StationParams
-    reliability: Dict[str, ReliabilityParams]
+    reliability: Tuple[Tuple[str, ReliabilityParams], ...]  # (name, params) pairs in draw order
     quality: QualityParams
     costs: CostsParams
     checksum: str
 
+    @property
+    def reliability_map(self) -> Dict[str, ReliabilityParams]:
+        # Name-keyed view of the reliability pairs, built fresh on each call
+        return dict(self.reliability)
+
 # ----------------------------
 # Deterministic RNG utilities
 # ----------------------------
+# The seed is part of the handout contract: every UUID already issued maps to
+# its parameters and checksum through the first 32 bits of SHA-256, so the
+# hash (and the Mersenne Twister it seeds) must not change.
 def make_rng(seed_text: str) -> random.Random:
-    digest = hashlib.sha256(seed_text.encode("utf-8")).hexdigest()
-    seed = int(digest[:8], 16)  # stable 32-bit seed
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    seed = int.from_bytes(digest[:4], "big")  # stable 32-bit seed (first 8 hex digits)
     return random.Random(seed)
 
 def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2) -> float:
@@ -86,16 +102,54 @@ def seeded_uniform(rng: random.Random, lo: float, hi: float, decimals: int = 2)
     return round(x, decimals)
 
 def seeded_int(rng: random.Random, lo: int, hi: int) -> int:
-    return rng.randint(lo, hi)
+    # Bit-masked rejection sampling: the same getrandbits() calls, and so the
+    # same values, as rng.randint(lo, hi), without randint -> randrange ->
+    # _randbelow and their argument checks
+    n = hi - lo + 1
+    k = n.bit_length()
+    r = rng.getrandbits(k)
+    while r >= n:
+        r = rng.getrandbits(k)
+    return lo + r
 
 def bounded_prob(rng: random.Random, lo: float, hi: float, decimals: int = 4) -> float:
     x = lo + (hi - lo) * rng.random()
     x = max(0.0, min(1.0, x))
     return round(x, decimals)
 
+# ----------------------------
+# Checksum serialisation
+# ----------------------------
+# Hand-written equivalents of json.dumps(asdict(obj), sort_keys=True), one per
+# data model: the keys are literals in sorted order and the values are read as
+# plain attributes. Every field of a model must appear here, so adding a field
+# to a dataclass means adding it to its serialiser too.
+def _global_json(g: GlobalParams) -> str:
+    return '{"demand_cv": %r, "oee_target": %r, "shift_length_hours": %r, "shifts_per_day": %r, "target_packs_per_day": %r}' % (
+        g.demand_cv, g.oee_target, g.shift_length_hours, g.shifts_per_day, g.target_packs_per_day)
+
+def _station_json(s: StationParams) -> str:
+    return '{"count": %r, "cycle_time_s": %r}' % (s.count, s.cycle_time_s)
+
+def _quality_json(q: QualityParams) -> str:
+    return '{"bms_misflash_rate": %r, "cell_capacity_sigma_pc": %r, "leak_fail_rate": %r, "module_false_fail": %r, "pack_false_fail": %r, "rework_success": %r, "tim_thickness_sigma_mm": %r, "weld_defect_rate": %r}' % (
+        q.bms_misflash_rate, q.cell_capacity_sigma_pc, q.leak_fail_rate, q.module_false_fail,
+        q.pack_false_fail, q.rework_success, q.tim_thickness_sigma_mm, q.weld_defect_rate)
+
+def _reliability_json(r: ReliabilityParams) -> str:
+    return '{"mtbf_min": %r, "mttr_min": %r}' % (r.mtbf_min, r.mttr_min)
+
+def _costs_json(c: CostsParams) -> str:
+    return '{"electricity_tariff_p_per_kwh": %r, "nitrogen_cost_per_hour": %r, "rework_labour_cost_per_hour": %r, "scrap_cost_per_pack": %r, "tim_cost_per_pack": %r}' % (
+        c.electricity_tariff_p_per_kwh, c.nitrogen_cost_per_hour, c.rework_labour_cost_per_hour,
+        c.scrap_cost_per_pack, c.tim_cost_per_pack)
+
 # ----------------------------
 # Parameter generation
 # ----------------------------
+# Results are shared between callers with the same UUID, so they are frozen
+# and hold only immutable values (reliability is a tuple of name/params pairs)
+@functools.lru_cache(maxsize=256)
 def generate(uuid_text: str) -> ScenarioParams:
     uuid_text = uuid_text.strip()
     rng = make_rng(uuid_text)
@@ -200,24 +254,24 @@ def generate(uuid_text: str) -> ScenarioParams:
         tim_cost_per_pack=seeded_uniform(rng, 6.0, 12.0, 2)
     )
 
-    # Checksum for verification
-    tmp = {
-        "uuid": uuid_text,
-        "global_params": asdict(global_params),
-        "cell_grading": asdict(cell_grading),
-        "module_assembly": asdict(module_assembly),
-        "laser_weld": asdict(laser_weld),
-        "module_eol": asdict(module_eol),
-        "pack_assembly": asdict(pack_assembly),
-        "bms_flash": asdict(bms_flash),
-        "pack_eol": asdict(pack_eol),
-        "leak_test": asdict(leak_test),
-        "reliability": {k: asdict(v) for k, v in reliability.items()},
-        "quality": asdict(quality),
-        "costs": asdict(costs),
-    }
-    blob = json.dumps(tmp, sort_keys=True).encode("utf-8")
-    checksum = hashlib.sha256(blob).hexdigest()[:12]
+    # Checksum for verification. The text is exactly json.dumps(..., sort_keys=True)
+    # of the params, written out directly with the top-level keys in sorted order.
+    blob = "".join((
+        '{"bms_flash": ', _station_json(bms_flash),
+        ', "cell_grading": ', _station_json(cell_grading),
+        ', "costs": ', _costs_json(costs),
+        ', "global_params": ', _global_json(global_params),
+        ', "laser_weld": ', _station_json(laser_weld),
+        ', "leak_test": ', _station_json(leak_test),
+        ', "module_assembly": ', _station_json(module_assembly),
+        ', "module_eol": ', _station_json(module_eol),
+        ', "pack_assembly": ', _station_json(pack_assembly),
+        ', "pack_eol": ', _station_json(pack_eol),
+        ', "quality": ', _quality_json(quality),
+        ', "reliability": {', ", ".join(f'"{k}": {_reliability_json(reliability[k])}' for k in sorted(reliability)),
+        '}, "uuid": ', json.dumps(uuid_text), '}',
+    )).encode("utf-8")
+    checksum = hashlib.sha256(blob).digest()[:6].hex()  # == hexdigest()[:12]
 
     return ScenarioParams(
         uuid=uuid_text,
@@ -230,7 +284,7 @@ def generate(uuid_text: str) -> ScenarioParams:
         bms_flash=bms_flash,
         pack_eol=pack_eol,
         leak_test=leak_test,
-        reliability=reliability,
+        reliability=tuple(reliability.items()),
         quality=quality,
         costs=costs,
         checksum=checksum
@@ -239,184 +293,245 @@ def generate(uuid_text: str) -> ScenarioParams:
 # ----------------------------
 # LaTeX rendering
 # ----------------------------
+# One pass over the text; since each character is replaced only once, the
+# backslashes introduced by the other escapes are never escaped again
+_TEX_TABLE = str.maketrans({
+    "\\": "\\textbackslash{}",
+    "&": "\\&",
+    "%": "\\%",
+    "$": "\\$",
+    "#": "\\#",
+    "_": "\\_",
+    "{": "\\{",
+    "}": "\\}",
+    "~": "\\textasciitilde{}",
+    "^": "\\textasciicircum{}",
+})
+
 def tex_escape(s: str) -> str:
-    return (s.replace("&", "\\&")
-             .replace("%", "\\%")
-             .replace("$", "\\$")
-             .replace("#", "\\#")
-             .replace("_", "\\_")
-             .replace("{", "\\{")
-             .replace("}", "\\}")
-             .replace("~", "\\textasciitilde{}")
-             .replace("^", "\\textasciicircum{}")
-             .replace("\\", "\\textbackslash{}"))
+    return s.translate(_TEX_TABLE)
+
+# Static text of the document, joined once at import and returned as is:
+# the preamble, the narrative sections before the parameter tables, and
+# everything after them
+_PREAMBLE = "\n".join((
+    r"\documentclass[11pt,a4paper]{article}",
+    r"\usepackage[margin=2.5cm,landscape]{geometry}",
+    r"\usepackage{booktabs}",
+    r"\usepackage{siunitx}",
+    r"\usepackage{enumitem}",
+    # Everything above is shared by all scenarios and can be dumped into a
+    # pdflatex format (mylatexformat); \relax when compiled normally
+    r"\csname endofdump\endcsname",
+    r"\usepackage[hidelinks]{hyperref}",
+    r"\usepackage{caption}",
+    r"\usepackage{longtable}",
+    r"\sisetup{detect-all=true}",
+    "",
+    r"\setlist[itemize]{nosep}",
+    r"\setlist[enumerate]{nosep}",
+    "",
+    r"\title{MENGM0056 - Product and Production Systems\\Scenario 5: Electric Vehicles - Battery Module and Pack Assembly}",
+    r"\author{Hand-out for Group Coursework (2025/26)}",
+    r"\date{}",
+    r"\begin{document}",
+    r"\maketitle",
+    "",
+)) + "\n"
+
+_INTRO = "\n".join((
+    "",
+    r"\section*{Purpose}",
+    r"This scenario covers a mid-volume EV battery module and pack assembly line. You receive seeded baseline parameters and must propose improvements that raise yield and throughput while maintaining safety and compliance, within typical operational constraints.",
+    "",
+    r"\section*{Narrative}",
+    r"The factory assembles 60~kWh battery packs from twelve 5~kWh modules using 21700 cells. Weld rework and pack end-of-line capacity are jointly constraining output. Field incidents in hot weather highlight thermal gradients at fast charge. Capital expenditure is limited in the short term; process, policy, and design-for-manufacture changes are preferred.",
+    "",
+    r"\section*{Entities and flow (fixed structure)}",
+    r"Incoming cell grading $\rightarrow$ Cell grouping $\rightarrow$ Module frame assembly $\rightarrow$ Laser tab-welding $\rightarrow$ Module end-of-line (EOL) electrical test $\rightarrow$ Pack assembly and busbar fit $\rightarrow$ BMS integration and firmware flash $\rightarrow$ Pack EOL (insulation resistance, HV leak, charge/discharge) $\rightarrow$ Leak test $\rightarrow$ Pack-out.",
+    "",
+    r"\section*{Baseline parameters (seeded)}",
+)) + "\n"
+
+_POSTAMBLE = "\n".join((
+    # KPIs
+    r"\section*{Required KPIs}",
+    r"\begin{itemize}",
+    r"\item Pack first-pass yield (FPY); module FPY; rolled throughput yield (RTY).",
+    r"\item Throughput (packs/day), EOL tester utilisation, and on-time delivery probability.",
+    r"\item Rework rate and rework hours/day; scrap cost per pack.",
+    r"\item Mean cell-to-cell capacity delta in module; maximum module temperature rise under 2C charge (if analysed).",
+    r"\item Queue length before pack EOL; WIP across welding and EOL.",
+    r"\end{itemize}",
+    # Techniques
+    r"\section*{Techniques to apply (choose appropriately)}",
+    r"\begin{itemize}",
+    r"\item \textbf{Modelling \& KPIs}: Genealogy/traceability KPI design; RTY ladder; capacity calculations.",
+    r"\item \textbf{CAE}: Thermal model of module and cooling interface to evaluate temperature gradients; busbar stiffness if vibration is considered.",
+    r"\item \textbf{Mathematical programming}: Cell grouping to minimise module variance; EOL tester scheduling and buffer sizing.",
+    r"\item \textbf{Uncertainty modelling}: Cell capacity distribution; weld defect probabilities; mis-flash and false-fail rates; Monte Carlo service-level estimation.",
+    r"\item \textbf{Simulation}: Discrete-event simulation of the whole line, including welding rework loop and EOL blocking; optional agent-based detail for operator–cobot interaction.",
+    r"\item \textbf{Metaheuristic optimisation}: Weld parameter set search (pulse energy, speed, focus) under FPY and cycle constraints; TIM thickness optimisation with thermal penalty.",
+    r"\end{itemize}",
+    # Levers
+    r"\section*{Improvement levers (examples, not exhaustive)}",
+    r"\begin{itemize}",
+    r"\item Introduce graded cell-binning rules to reduce intra-module variance and quantify warranty risk impact.",
+    r"\item Reallocate module vs. pack EOL testers by time-of-day to relieve peak blocking; adjust buffers accordingly.",
+    r"\item Tune weld parameters to cut splash while respecting takt; compare search vs. DOE.",
+    r"\item Reduce TIM thickness variance via supplier spec and quantify $\Delta T$ reduction at fast charge.",
+    r"\item Evaluate preventive maintenance on weld heads vs. adding a small rework bench; compare cost per additional good pack.",
+    r"\end{itemize}",
+    # Deliverables
+    r"\section*{Deliverables}",
+    r"\begin{enumerate}",
+    r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).",
+    r"\item The report should contain an executive summary for senior management.",
+    r"\item Model files (e.g., simulation, optimisation, CAE) as appendices/evidence.",
+    r"\end{enumerate}",
+    # Assessment
+    r"\section*{Assessment emphasis}",
+    r"Clarity of problem framing and KPI choice; correctness and transparency of models; appropriateness of technique selection; quality of experimental design; depth of analysis on yield, EOL capacity, and thermal performance; and persuasiveness of recommendations under operational constraints.",
+    # Reproducibility
+    r"\section*{Data ethics and reproducibility}",
+    r"Report your UUID seed and any random seeds used. Include enough detail to allow independent regeneration of your parameter tables.",
+    "",
+    r"\end{document}",
+))
 
-def render_latex(p: ScenarioParams) -> str:
-    g = p.global_params
-    q = p.quality
-
-    lines = []
-    lines.append(r"\documentclass[11pt,a4paper]{article}")
-    lines.append(r"\usepackage[margin=2.5cm,landscape]{geometry}")
-    lines.append(r"\usepackage{booktabs}")
-    lines.append(r"\usepackage{siunitx}")
-    lines.append(r"\usepackage{enumitem}")
-    lines.append(r"\usepackage[hidelinks]{hyperref}")
-    lines.append(r"\usepackage{caption}")
-    lines.append(r"\usepackage{longtable}")
-    lines.append(r"\sisetup{detect-all=true}")
-    lines.append("")
-    lines.append(r"\setlist[itemize]{nosep}")
-    lines.append(r"\setlist[enumerate]{nosep}")
-    lines.append("")
-    lines.append(r"\title{MENGM0056 - Product and Production Systems\\Scenario 5: Electric Vehicles - Battery Module and Pack Assembly}")
-    lines.append(r"\author{Hand-out for Group Coursework (2025/26)}")
-    lines.append(r"\date{}")
-    lines.append(r"\begin{document}")
-    lines.append(r"\maketitle")
-    lines.append("")
-    lines.append(r"\noindent \textbf{UUID seed:} " + tex_escape(p.uuid) + r" \quad \textbf{Checksum:} " + p.checksum)
-    lines.append("")
-    lines.append(r"\section*{Purpose}")
-    lines.append(r"This scenario covers a mid-volume EV battery module and pack assembly line. You receive seeded baseline parameters and must propose improvements that raise yield and throughput while maintaining safety and compliance, within typical operational constraints.")
-    lines.append("")
-    lines.append(r"\section*{Narrative}")
-    lines.append(r"The factory assembles 60~kWh battery packs from twelve 5~kWh modules using 21700 cells. Weld rework and pack end-of-line capacity are jointly constraining output. Field incidents in hot weather highlight thermal gradients at fast charge. Capital expenditure is limited in the short term; process, policy, and design-for-manufacture changes are preferred.")
-    lines.append("")
-    lines.append(r"\section*{Entities and flow (fixed structure)}")
-    lines.append(r"Incoming cell grading $\rightarrow$ Cell grouping $\rightarrow$ Module frame assembly $\rightarrow$ Laser tab-welding $\rightarrow$ Module end-of-line (EOL) electrical test $\rightarrow$ Pack assembly and busbar fit $\rightarrow$ BMS integration and firmware flash $\rightarrow$ Pack EOL (insulation resistance, HV leak, charge/discharge) $\rightarrow$ Leak test $\rightarrow$ Pack-out.")
-    lines.append("")
-    lines.append(r"\section*{Baseline parameters (seeded)}")
+_UUID_LINE = r"\noindent \textbf{{UUID seed:}} {uuid_esc} \quad \textbf{{Checksum:}} {p.checksum}" + "\n"
 
+# The parameter tables as one str.format template (LaTeX braces doubled); only
+# the seeded values and the few derived strings below are substituted per call
+_TABLES = "\n".join((
     # Global
-    lines.append(r"\subsection*{Global}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Shifts per day & {g.shifts_per_day} \\")
-    lines.append(rf"Shift length & {g.shift_length_hours}~h \\")
-    lines.append(rf"Target packs/day & {g.target_packs_per_day} \\")
-    lines.append(rf"OEE target & {int(g.oee_target*100)}\% \\")
-    lines.append(rf"Demand CV & {g.demand_cv} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Global}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Shifts per day & {g.shifts_per_day} \\",
+    r"Shift length & {g.shift_length_hours}~h \\",
+    r"Target packs/day & {g.target_packs_per_day} \\",
+    r"OEE target & {oee_pct}\% \\",
+    r"Demand CV & {g.demand_cv} \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Stations
-    lines.append(r"\subsection*{Stations and timings}")
-    lines.append(r"\begin{tabular}{@{}llll@{}}")
-    lines.append(r"\toprule")
-    lines.append(r"\textbf{Stage} & \textbf{Count} & \textbf{Cycle/Test time} & \textbf{Notes} \\")
-    lines.append(r"\midrule")
-    lines.append(rf"Cell grading testers & {p.cell_grading.count} & {p.cell_grading.cycle_time_s}~s/batch & Capacity sets bin inventory \\")
-    lines.append(rf"Module assembly lines & {p.module_assembly.count} & {p.module_assembly.cycle_time_s}~s/module & Frame, placement, torque \\")
-    lines.append(rf"Laser weld heads & {p.laser_weld.count} & {p.laser_weld.cycle_time_s}~s/module & Weld splash rework loop \\")
-    lines.append(rf"Module EOL testers & {p.module_eol.count} & {p.module_eol.cycle_time_s}~s/module & Electrical characterisation \\")
-    lines.append(rf"Pack assembly line & {p.pack_assembly.count} & {p.pack_assembly.cycle_time_s}~s/pack & Mechanical fit and busbars \\")
-    lines.append(rf"BMS flash stations & {p.bms_flash.count} & {p.bms_flash.cycle_time_s}~s/pack & Firmware load and config \\")
-    lines.append(rf"Pack EOL testers & {p.pack_eol.count} & {p.pack_eol.cycle_time_s}~s/pack & Insulation, charge/discharge \\")
-    lines.append(rf"Leak testers & {p.leak_test.count} & {p.leak_test.cycle_time_s}~s/pack & Enclosure integrity \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Stations and timings}}",
+    r"\begin{{tabular}}{{@{{}}llll@{{}}}}",
+    r"\toprule",
+    r"\textbf{{Stage}} & \textbf{{Count}} & \textbf{{Cycle/Test time}} & \textbf{{Notes}} \\",
+    r"\midrule",
+    "{station_rows}",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Quality and variation
-    lines.append(r"\subsection*{Quality, variation, and reliability}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Weld defect rate & {q.weld_defect_rate} \\")
-    lines.append(rf"Weld rework success & {q.rework_success} \\")
-    lines.append(rf"Module EOL false fail & {q.module_false_fail} \\")
-    lines.append(rf"Pack EOL false fail & {q.pack_false_fail} \\")
-    lines.append(rf"BMS mis-flash rate & {q.bms_misflash_rate} \\")
-    lines.append(rf"Leak test fail (true) & {q.leak_fail_rate} \\")
-    lines.append(rf"Cell capacity $\sigma$ & {q.cell_capacity_sigma_pc}\% of nominal \\")
-    lines.append(rf"TIM thickness $\sigma$ & {q.tim_thickness_sigma_mm}~mm \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-    lines.append(r"\begin{tabular}{@{}lll@{}}")
-    lines.append(r"\toprule Resource & MTBF (min) & MTTR (min) \\")
-    lines.append(r"\midrule")
-    for k, v in p.reliability.items():
-        lines.append(rf"{k} & {v.mtbf_min} & {v.mttr_min} \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
+    r"\subsection*{{Quality, variation, and reliability}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Weld defect rate & {q.weld_defect_rate} \\",
+    r"Weld rework success & {q.rework_success} \\",
+    r"Module EOL false fail & {q.module_false_fail} \\",
+    r"Pack EOL false fail & {q.pack_false_fail} \\",
+    r"BMS mis-flash rate & {q.bms_misflash_rate} \\",
+    r"Leak test fail (true) & {q.leak_fail_rate} \\",
+    r"Cell capacity $\sigma$ & {q.cell_capacity_sigma_pc}\% of nominal \\",
+    r"TIM thickness $\sigma$ & {q.tim_thickness_sigma_mm}~mm \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+    r"\begin{{tabular}}{{@{{}}lll@{{}}}}",
+    r"\toprule Resource & MTBF (min) & MTTR (min) \\",
+    r"\midrule",
+    "{reliability_rows}",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
     # Costs
-    lines.append(r"\subsection*{Costs}")
-    lines.append(r"\begin{tabular}{@{}ll@{}}")
-    lines.append(r"\toprule")
-    lines.append(rf"Scrap cost (per pack) & \pounds {p.costs.scrap_cost_per_pack} \\")
-    lines.append(rf"Rework labour & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\")
-    lines.append(rf"Electricity tariff & {p.costs.electricity_tariff_p_per_kwh}~p/kWh \\")
-    lines.append(rf"Nitrogen shield gas & \pounds {p.costs.nitrogen_cost_per_hour}~/h \\")
-    lines.append(rf"TIM material & \pounds {p.costs.tim_cost_per_pack}~/pack \\")
-    lines.append(r"\bottomrule")
-    lines.append(r"\end{tabular}")
-    lines.append("")
-
-    # KPIs
-    lines.append(r"\section*{Required KPIs}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Pack first-pass yield (FPY); module FPY; rolled throughput yield (RTY).")
-    lines.append(r"\item Throughput (packs/day), EOL tester utilisation, and on-time delivery probability.")
-    lines.append(r"\item Rework rate and rework hours/day; scrap cost per pack.")
-    lines.append(r"\item Mean cell-to-cell capacity delta in module; maximum module temperature rise under 2C charge (if analysed).")
-    lines.append(r"\item Queue length before pack EOL; WIP across welding and EOL.")
-    lines.append(r"\end{itemize}")
-
-    # Techniques
-    lines.append(r"\section*{Techniques to apply (choose appropriately)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item \textbf{Modelling \& KPIs}: Genealogy/traceability KPI design; RTY ladder; capacity calculations.")
-    lines.append(r"\item \textbf{CAE}: Thermal model of module and cooling interface to evaluate temperature gradients; busbar stiffness if vibration is considered.")
-    lines.append(r"\item \textbf{Mathematical programming}: Cell grouping to minimise module variance; EOL tester scheduling and buffer sizing.")
-    lines.append(r"\item \textbf{Uncertainty modelling}: Cell capacity distribution; weld defect probabilities; mis-flash and false-fail rates; Monte Carlo service-level estimation.")
-    lines.append(r"\item \textbf{Simulation}: Discrete-event simulation of the whole line, including welding rework loop and EOL blocking; optional agent-based detail for operator–cobot interaction.")
-    lines.append(r"\item \textbf{Metaheuristic optimisation}: Weld parameter set search (pulse energy, speed, focus) under FPY and cycle constraints; TIM thickness optimisation with thermal penalty.")
-    lines.append(r"\end{itemize}")
-
-    # Levers
-    lines.append(r"\section*{Improvement levers (examples, not exhaustive)}")
-    lines.append(r"\begin{itemize}")
-    lines.append(r"\item Introduce graded cell-binning rules to reduce intra-module variance and quantify warranty risk impact.")
-    lines.append(r"\item Reallocate module vs. pack EOL testers by time-of-day to relieve peak blocking; adjust buffers accordingly.")
-    lines.append(r"\item Tune weld parameters to cut splash while respecting takt; compare search vs. DOE.")
-    lines.append(r"\item Reduce TIM thickness variance via supplier spec and quantify $\Delta T$ reduction at fast charge.")
-    lines.append(r"\item Evaluate preventive maintenance on weld heads vs. adding a small rework bench; compare cost per additional good pack.")
-    lines.append(r"\end{itemize}")
-
-    # Deliverables
-    lines.append(r"\section*{Deliverables}")
-    lines.append(r"\begin{enumerate}")
-    lines.append(r"\item A report (max 20 sides of A4 including figures and references; appendices unmarked but admissible as evidence).")
-    lines.append(r"\item The report should contain an executive summary for senior management.")
-    lines.append(r"\item Model files (e.g., simulation, optimisation, CAE) as appendices/evidence.")
-    lines.append(r"\end{enumerate}")
-
-    # Assessment
-    lines.append(r"\section*{Assessment emphasis}")
-    lines.append(r"Clarity of problem framing and KPI choice; correctness and transparency of models; appropriateness of technique selection; quality of experimental design; depth of analysis on yield, EOL capacity, and thermal performance; and persuasiveness of recommendations under operational constraints.")
+    r"\subsection*{{Costs}}",
+    r"\begin{{tabular}}{{@{{}}ll@{{}}}}",
+    r"\toprule",
+    r"Scrap cost (per pack) & \pounds {p.costs.scrap_cost_per_pack} \\",
+    r"Rework labour & \pounds {p.costs.rework_labour_cost_per_hour}~/h \\",
+    r"Electricity tariff & {p.costs.electricity_tariff_p_per_kwh}~p/kWh \\",
+    r"Nitrogen shield gas & \pounds {p.costs.nitrogen_cost_per_hour}~/h \\",
+    r"TIM material & \pounds {p.costs.tim_cost_per_pack}~/pack \\",
+    r"\bottomrule",
+    r"\end{{tabular}}",
+    "",
+)) + "\n"
+
+# Rows of the stations table, in print order: the ScenarioParams field, then
+# the stage label, the unit of the cycle/test time and the notes column
+_STATIONS = (
+    ("cell_grading", "Cell grading testers", "s/batch", "Capacity sets bin inventory"),
+    ("module_assembly", "Module assembly lines", "s/module", "Frame, placement, torque"),
+    ("laser_weld", "Laser weld heads", "s/module", "Weld splash rework loop"),
+    ("module_eol", "Module EOL testers", "s/module", "Electrical characterisation"),
+    ("pack_assembly", "Pack assembly line", "s/pack", "Mechanical fit and busbars"),
+    ("bms_flash", "BMS flash stations", "s/pack", "Firmware load and config"),
+    ("pack_eol", "Pack EOL testers", "s/pack", "Insulation, charge/discharge"),
+    ("leak_test", "Leak testers", "s/pack", "Enclosure integrity"),
+)
+
+def _station_rows(p: ScenarioParams):
+    for name, label, unit, note in _STATIONS:
+        s = getattr(p, name)
+        yield f"{label} & {s.count} & {s.cycle_time_s}~{unit} & {note} \\\\"
+
+def _template_values(p: ScenarioParams) -> dict:
+    g = p.global_params
+    return dict(
+        p=p, g=g, q=p.quality,
+        uuid_esc=tex_escape(p.uuid),
+        oee_pct=int(g.oee_target*100),
+        station_rows="\n".join(_station_rows(p)),
+        reliability_rows="\n".join(f"{k} & {v.mtbf_min} & {v.mttr_min} \\\\" for k, v in p.reliability),
+    )
 
-    # Reproducibility
-    lines.append(r"\section*{Data ethics and reproducibility}")
-    lines.append(r"Report your UUID seed and any random seeds used. Include enough detail to allow independent regeneration of your parameter tables.")
-    lines.append("")
-    lines.append(r"\end{document}")
-    return "\n".join(lines)
+def render_latex(p: ScenarioParams) -> str:
+    values = _template_values(p)
+    return "".join((_PREAMBLE, _UUID_LINE.format_map(values), _INTRO, _TABLES.format_map(values), _POSTAMBLE))
+
+# The static blocks as written by write_latex(), encoded once at import
+_PREAMBLE_UTF8 = _PREAMBLE.encode("utf-8")
+_INTRO_UTF8 = _INTRO.encode("utf-8")
+_POSTAMBLE_UTF8 = (_POSTAMBLE + "\n").encode("utf-8")
+
+def write_latex(p: ScenarioParams, out) -> None:
+    # Writes the document and a final newline as UTF-8 to a binary stream such
+    # as sys.stdout.buffer, piece by piece rather than as one joined string
+    values = _template_values(p)
+    out.write(_PREAMBLE_UTF8)
+    out.write(_UUID_LINE.format_map(values).encode("utf-8"))
+    out.write(_INTRO_UTF8)
+    out.write(_TABLES.format_map(values).encode("utf-8"))
+    out.write(_POSTAMBLE_UTF8)
 
 # ----------------------------
 # Main
 # ----------------------------
+def _render_one(uuid_text: str):
+    params = generate(uuid_text)
+    return params.uuid, render_latex(params)
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--uuid", required=True, help="UUID string (any version).")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--uuid", help="UUID string (any version).")
+    src.add_argument("--uuid-file", help="File with one UUID per line (batch mode).")
+    ap.add_argument("--out-dir", default=".", help="Batch mode output directory (default: current).")
     args = ap.parse_args()
 
-    params = generate(args.uuid)
-    tex = render_latex(params)
-    print(tex)
+    if args.uuid_file:
+        sys.exit(handout_batch.run(_render_one, args.uuid_file, args.out_dir, "mengm0056_s5_handout.tex"))
+
+    write_latex(generate(args.uuid), sys.stdout.buffer)
+    sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
+    # Params must stay plain data: asdict() for JSON and pickle for worker processes
+    _p = generate("00000000-0000-0000-0000-000000000000")
+    assert pickle.loads(pickle.dumps(_p)) == _p and asdict(_p)["reliability"][0][0] == "CellGrading"
     main()
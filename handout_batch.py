@@ -0,0 +1,45 @@
+"""
+Batch mode shared by the scenario generators' --uuid-file option: renders a
+roster of UUIDs into <out-dir>/<uuid>/<filename>, one process per core.
+"""
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Canonical lower-case UUID, the same shape app.py accepts. Roster lines become
+# directory names, so anything else ("../x", an absolute path, ...) is refused.
+UUID_RE = re.compile(r"\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z")
+
+def read_roster(path: str) -> tuple:
+    # Returns (valid UUIDs, number rejected); blank lines are ignored and every
+    # rejected line is reported on stderr
+    uuids, rejected = [], 0
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            u = line.strip()
+            if not u:
+                continue
+            if UUID_RE.match(u):
+                uuids.append(u)
+            else:
+                print(f"{path}:{lineno}: not a lower-case UUID, skipped: {u!r}", file=sys.stderr)
+                rejected += 1
+    return uuids, rejected
+
+def write_batch(render_one, uuid_texts, out_dir: str, filename: str):
+    # render_one(uuid) -> (uuid, tex) must be a module-level function so it can
+    # be sent to the worker processes; each UUID is independent
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for uuid_text, tex in ex.map(render_one, uuid_texts, chunksize=16):
+            folder = os.path.join(out_dir, uuid_text)
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, filename), "wb") as f:
+                f.write(tex.encode("utf-8") + b"\n")
+
+def run(render_one, roster_path: str, out_dir: str, filename: str) -> int:
+    # The --uuid-file mode: returns the exit status, 1 if any line was rejected
+    uuids, rejected = read_roster(roster_path)
+    write_batch(render_one, uuids, out_dir, filename)
+    return 1 if rejected else 0